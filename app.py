@@ -1,13 +1,31 @@
-from flask import Flask, render_template, jsonify, redirect, send_from_directory
+from flask import Flask, render_template, jsonify, redirect, send_from_directory, Response, request, g, url_for
+from markupsafe import Markup
 import os
+import hashlib
 from dotenv import load_dotenv
-import requests
 import logging
 from flask_cors import CORS
 from datetime import datetime
 import time
 import json
+from decimal import Decimal, ROUND_HALF_UP
 import pytz
+import psutil
+import threading
+from collections import deque, OrderedDict
+import upstream
+import feed
+from cache_backend import create_backend
+import warm_start
+import assets
+import cadence
+import history
+import standings
+from field import Field, normalize_name, player_signature, diff_fields, merge_changes
+from payouts import PayoutTable, project_payouts, position_number, UNPAID_STATUSES
+from simulate import simulate_league
+from debug_capture import DEBUG_CAPTURE, start_debug_capture, capture_payload, capture_player
+from metrics import Counter, Gauge, Histogram, SIZE_BUCKETS, render_metrics
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -28,18 +46,101 @@ logger = logging.getLogger(__name__)
 TOURNAMENT_CACHE = {
     'data': None,
     'last_updated': None,
-    'cache_duration': 600,  # Increase cache duration to 10 minutes
-    'tournament_id': 'ae058906-abf0-4341-9c30-646b3ab4581f'  # RBC Heritage 2025 ID
+    'cache_duration': cadence.CADENCE['default_interval'],  # Seconds until the next pull, as planned by each fetch (None once closed)
+    'tournament_id': 'ae058906-abf0-4341-9c30-646b3ab4581f',  # RBC Heritage 2025 ID
+    'summary_duration': 3600,  # Tournament details rarely change, so the summary is re-pulled hourly
+    'generation': 0  # Bumped on every successful fetch so derived views know when to rebuild
 }
 
-# Rate limiting settings
-RATE_LIMIT = {
-    'last_request': None,
-    'min_interval': 1.0,  # Increase minimum interval between requests to 1 second
-    'retry_count': 0,
-    'max_retries': 3  # Increase max retries to 3
+# Tournament details shown until the first summary arrives (or if SportsRadar never returns one)
+TOURNAMENT_DEFAULTS = {
+    'name': 'RBC Heritage',
+    'start_date': '2025-04-17',
+    'end_date': '2025-04-20',
+    'venue': {'name': 'Harbour Town Golf Links'}
 }
 
+# Background refresh settings
+REFRESHER = {
+    'enabled': os.getenv('DISABLE_REFRESHER') != '1',
+    'poll_interval': 30,  # Seconds between checks for whether the cache is due for a refresh
+    'thread': None
+}
+
+# Single-flight guard so concurrent cache misses never trigger duplicate fetches
+REFRESH_LOCK = threading.Lock()
+
+# Signalled whenever TOURNAMENT_CACHE moves to a new generation (used by the SSE stream)
+GENERATION_CHANGED = threading.Condition()
+
+# Shared snapshot and rate-limit state; set CACHE_BACKEND=sqlite to share it across gunicorn workers
+CACHE_BACKEND = create_backend()
+upstream.set_rate_limiter(CACHE_BACKEND)
+
+# Season-long standings: completed events are fetched once, folded in and memoized on disk
+SEASON = {
+    'year': int(os.getenv('SEASON_YEAR', '2025')),
+    'schedule': None,
+    'schedule_updated': None,
+    'schedule_duration': 21600,  # The schedule only changes when an event finishes, so it's re-pulled every 6 hours
+    'backfill_per_poll': 3  # Completed events fetched per refresher pass, so a cold start doesn't hog the rate limit
+}
+
+# Append-only log of every fetched snapshot, for movement charts; None when HISTORY_PATH is ''
+HISTORY = history.open_history()
+
+# Name-indexed field models and payout projections, as {(id(payload), purse): (payload, Field, payouts)}; room for
+# the live event, its previous snapshot and every registry event, evicted least recently used first
+FIELD_CACHE = {
+    'entries': OrderedDict(),
+    'max_entries': int(os.getenv('REGISTRY_MAX_ENTRIES', '8')) + 2,
+    'lock': threading.Lock()
+}
+
+# Formatted rows keyed by normalized name, reused until that player's feed entry changes
+ROW_CACHE = {}
+
+# Player-level changes between successive generations, newest last, for ?since=<generation> deltas
+CHANGE_LOG = deque(maxlen=50)
+
+# Serialized API responses derived from TOURNAMENT_CACHE, rebuilt once per cache generation
+VIEW_CACHE = {}
+
+# /millerlite/api/field paging and columns; each distinct query is a view, so they're capped per generation
+FIELD_QUERY = {
+    'default_limit': 50,
+    'max_limit': 500,
+    'max_views': 256,  # Oldest query views are dropped past this many in one generation
+    'columns': ('player', 'position', 'position_number', 'tied', 'score', 'today', 'thru', 'payout', 'status'),
+    'cut_values': ('made', 'missed')
+}
+
+# Static files with content-hashed URLs and precompressed variants, built once at startup
+ASSETS = assets.build_manifest(app.static_folder)
+ASSETS_BY_HASHED_PATH = {asset.hashed_path: asset for asset in ASSETS.values()}
+
+# Rendered page per league, as {league: {'fingerprint', 'variants', 'etag'}}; rebuilt once per cache generation or config change
+SHELL_CACHE = {}
+
+# Caches for events other than the live one, keyed by (year, tournament_id) and evicted least recently used first
+REGISTRY = {
+    'entries': OrderedDict(),
+    'max_entries': int(os.getenv('REGISTRY_MAX_ENTRIES', '8')),
+    'retry_interval': 60,  # Seconds before retrying an event whose fetch failed
+    'closed_max_age': 86400,  # Browser max-age for finished events, whose data never changes
+    'lock': threading.Lock()
+}
+
+# Server-Sent Events settings and the events built for the latest generation
+STREAM = {
+    'heartbeat_interval': 25,  # Seconds between keep-alive comments so proxies don't drop idle streams
+    'retry': 5000,  # Milliseconds the browser waits before reconnecting
+    'diff_fields': ('position', 'position_number', 'tied', 'score', 'today', 'thru', 'payout')
+}
+# Per-league stream state: {league: {'previous_generation', 'generation', 'league', 'snapshot', 'delta'}}
+STREAM_STATES = {}
+STREAM_LOCK = threading.Lock()
+
 LEAGUE_MEMBERS = {
     "Charlie Burns": "Scottie Scheffler",
     "Donald Rein": "Jordan Spieth",
@@ -62,6 +163,27 @@ LEAGUE_MEMBERS = {
     "Zach Schafer": "Ryan Gerard"
 }
 
+# Picks tables by league name; LEAGUES_FILE can add more as {"league": {"member": "golfer"}} without a code change
+DEFAULT_LEAGUE = 'millerlite'
+LEAGUES = {DEFAULT_LEAGUE: LEAGUE_MEMBERS}
+
+def load_leagues(path=None):
+    """Load extra leagues from LEAGUES_FILE, if one is configured."""
+    path = path or os.getenv('LEAGUES_FILE')
+    if not path:
+        return {}
+    try:
+        with open(path) as leagues_file:
+            return json.load(leagues_file)
+    except Exception as e:
+        logger.error(f"Error loading leagues from {path}: {str(e)}")
+        return {}
+
+LEAGUES.update(load_leagues())
+
+# Season standings per league, each folding completed events in once and memoizing them on disk
+SEASON_STANDINGS = {league: standings.SeasonStandings(league, SEASON['year']) for league in LEAGUES}
+
 PAYOUT_STRUCTURE = {
     1: 3600000,
     2: 2160000,
@@ -135,67 +257,51 @@ PAYOUT_STRUCTURE = {
     70: 37500
 }
 
-SPORTSRADAR_API_KEY = os.getenv('SPORTSRADAR_API_KEY')
-SPORTSRADAR_BASE_URL = "https://api.sportradar.com/golf/trial/pga/v3/en"
+# PAYOUT_STRUCTURE is for a $20M purse; other tournaments scale it to their own purse
+PAYOUT_BASE_PURSE = 20000000
 
-def log_memory_usage():
-    """Log current memory usage."""
-    import psutil
-    process = psutil.Process()
-    memory_info = process.memory_info()
-    logger.info(f"Memory usage: {memory_info.rss / 1024 / 1024:.2f} MB")
+# Made-cut players past 70th keep getting paid, one step less per position
+PAYOUT_MAX_POSITIONS = 90
 
-def make_api_request(url, headers, params):
-    """Make an API request with rate limiting and retry logic."""
-    current_time = time.time()
-    log_memory_usage()  # Log memory usage before request
-    
-    # Check if we need to wait due to rate limiting
-    if RATE_LIMIT['last_request'] is not None:
-        time_since_last = current_time - RATE_LIMIT['last_request']
-        if time_since_last < RATE_LIMIT['min_interval']:
-            time.sleep(RATE_LIMIT['min_interval'] - time_since_last)
-    
-    try:
-        logger.info(f"Making API request to: {url}")
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        RATE_LIMIT['last_request'] = time.time()
-        
-        if response.status_code == 429:  # Rate limit exceeded
-            logger.warning("Rate limit exceeded")
-            if RATE_LIMIT['retry_count'] < RATE_LIMIT['max_retries']:
-                RATE_LIMIT['retry_count'] += 1
-                wait_time = min(2 ** RATE_LIMIT['retry_count'], 30)
-                logger.info(f"Retrying in {wait_time} seconds (attempt {RATE_LIMIT['retry_count']})")
-                time.sleep(wait_time)
-                return make_api_request(url, headers, params)
-            else:
-                logger.error("Max retries reached for rate limit")
-                return None
-        elif response.status_code != 200:
-            logger.error(f"API Error: {response.status_code}")
-            logger.error(f"Response: {response.text}")
-            return None
-            
-        RATE_LIMIT['retry_count'] = 0
-        log_memory_usage()  # Log memory usage after successful request
-        return response.json()
-    except requests.exceptions.Timeout:
-        logger.error("Request timed out")
-        return None
-    except Exception as e:
-        logger.error(f"Error making API request: {str(e)}")
-        return None
+# Payout tables per purse, built on first use
+PAYOUT_TABLES = {}
+
+# Instrumentation served at /millerlite/metrics; all updates are cheap in-memory counters
+CACHE_LOOKUPS = Counter('millerlite_cache_lookups_total', 'Tournament cache lookups by result (hit or miss)')
+VIEW_LOOKUPS = Counter('millerlite_view_cache_lookups_total', 'Serialized view lookups by view and result (hit or miss)')
+# View names carry generations, versions, leagues and queries; the metric label is only ever one of these kinds
+VIEW_KINDS = ('leaderboard-since', 'leaderboard', 'standings', 'odds', 'tournament', 'field')
+CACHE_AGE = Gauge(
+    'millerlite_cache_age_seconds', 'Seconds since the cached tournament data was fetched',
+    callback=lambda: time.time() - TOURNAMENT_CACHE['last_updated'] if TOURNAMENT_CACHE['last_updated'] else None
+)
+CACHE_GENERATION = Gauge(
+    'millerlite_cache_generation', 'Current tournament cache generation',
+    callback=lambda: TOURNAMENT_CACHE['generation']
+)
+REQUEST_LATENCY = Histogram('millerlite_http_request_duration_seconds', 'Request handling latency by endpoint')
+RESPONSE_SIZE = Histogram('millerlite_http_response_size_bytes', 'Response body size by endpoint', SIZE_BUCKETS)
+PROCESS_RSS = Gauge('millerlite_process_resident_memory_bytes', 'Resident memory of this worker, sampled periodically')
+PROCESS = psutil.Process()
+
+def sample_memory_usage():
+    """Record the current resident memory of this process."""
+    PROCESS_RSS.set(PROCESS.memory_info().rss)
+
+def make_api_request(url, headers=None, params=None, parser=None, max_age=None):
+    """Make an API request through the shared upstream client (pooled, rate limited, retried, cached on disk)."""
+    return upstream.fetch_json(url, params=params, headers=headers, parser=parser, max_age=max_age)
+
+def get_leaderboard_parser():
+    """Stream leaderboards down to the fields we use, unless debug capture wants the raw payloads."""
+    return None if DEBUG_CAPTURE['enabled'] else feed.parse_leaderboard
 
 def fetch_tournament_schedule(year):
     """Fetch the tournament schedule for a given year."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/{year}/tournaments/schedule.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
-        
         logger.info(f"Fetching {year} tournament schedule...")
-        return make_api_request(url, headers, params)
+        # A restart within the schedule's refresh interval reuses the copy on disk instead of asking again
+        return make_api_request(upstream.build_url(upstream.schedule_path(year)), max_age=SEASON['schedule_duration'])
     except Exception as e:
         logger.error(f"Error fetching schedule: {str(e)}")
         return None
@@ -203,12 +309,8 @@ def fetch_tournament_schedule(year):
 def fetch_tournament_summary(year, tournament_id):
     """Fetch detailed tournament summary."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/{year}/tournaments/{tournament_id}/summary.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
-        
         logger.info(f"Fetching tournament summary...")
-        return make_api_request(url, headers, params)
+        return make_api_request(upstream.build_url(upstream.summary_path(year, tournament_id)))
     except Exception as e:
         logger.error(f"Error fetching tournament summary: {str(e)}")
         return None
@@ -216,200 +318,611 @@ def fetch_tournament_summary(year, tournament_id):
 def fetch_tournament_leaderboard(year, tournament_id):
     """Fetch tournament leaderboard data."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/{year}/tournaments/{tournament_id}/leaderboard.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
-        
         logger.info(f"Fetching tournament leaderboard...")
-        response = make_api_request(url, headers, params)
+        response = make_api_request(
+            upstream.build_url(upstream.leaderboard_path(year, tournament_id)), parser=get_leaderboard_parser()
+        )
         if response:
-            logger.info("=== RAW API RESPONSE ===")
-            logger.info(json.dumps(response, indent=2))
-            logger.info("=======================")
+            capture_payload('leaderboard', response)
         return response
     except Exception as e:
         logger.error(f"Error fetching leaderboard: {str(e)}")
         return None
 
-def get_cached_data():
-    """Get cached tournament data or fetch new data if needed."""
-    current_time = time.time()
+def fetch_tournament_bundle(year, tournament_id, include_summary=True):
+    """Fetch the leaderboard (and optionally the summary) concurrently."""
+    urls = {'leaderboard': upstream.build_url(upstream.leaderboard_path(year, tournament_id))}
+    if include_summary:
+        urls['summary'] = upstream.build_url(upstream.summary_path(year, tournament_id))
     
-    # Check if we have cached data and if it's still valid
-    if TOURNAMENT_CACHE['data'] and TOURNAMENT_CACHE['last_updated']:
-        time_since_update = current_time - TOURNAMENT_CACHE['last_updated']
-        
-        # Get current time in PT
-        pt_time = datetime.now().astimezone(pytz.timezone('America/Los_Angeles'))
-        current_hour = pt_time.hour
+    try:
+        logger.info(f"Fetching tournament {', '.join(urls)}...")
+        results = upstream.fetch_batch(urls, {'leaderboard': get_leaderboard_parser()})
+        if results.get('leaderboard'):
+            capture_payload('leaderboard', results['leaderboard'])
+        return results
+    except Exception as e:
+        logger.error(f"Error fetching tournament bundle: {str(e)}")
+        return {}
+
+def build_tournament_info(tournament_id, summary, leaderboard_data, previous=None):
+    """Assemble the cached tournament details from summary data, keeping what we had when there's no summary."""
+    info = dict(TOURNAMENT_DEFAULTS if previous is None else previous)
+    if summary:
+        venue = summary.get('venue', {})
+        info.update({
+            'name': summary.get('name', info.get('name')),
+            'start_date': summary.get('start_date', info.get('start_date')),
+            'end_date': summary.get('end_date', info.get('end_date')),
+            'venue': {key: venue[key] for key in ('name', 'city', 'state', 'country') if key in venue},
+            'purse': summary.get('purse'),
+            'course_timezone': summary.get('course_timezone')
+        })
+    # Summaries without a purse fall back to the leaderboard's, so every view of a snapshot projects from the same one
+    info['purse'] = info.get('purse') or leaderboard_data.get('purse')
+    info['id'] = tournament_id
+    info['status'] = leaderboard_data.get('status', info.get('status'))
+    info['round'] = leaderboard_data.get('round', 1)
+    return info
+
+def is_refresh_due():
+    """Check whether the cached data should be refreshed from SportsRadar."""
+    return seconds_until_refresh() <= 0
+
+def seconds_until_refresh():
+    """Seconds until the cached data is due for a refresh (zero or less when due, infinite once the event is closed)."""
+    if not TOURNAMENT_CACHE['data'] or not TOURNAMENT_CACHE['last_updated']:
+        return 0
+    if TOURNAMENT_CACHE['cache_duration'] is None:
+        return float('inf')
+    return TOURNAMENT_CACHE['cache_duration'] - (time.time() - TOURNAMENT_CACHE['last_updated'])
+
+def get_refresh_interval(data):
+    """Get the refresh interval a snapshot was planned with (snapshots from before cadence planning get the default)."""
+    plan = data.get('cadence')
+    return plan['interval'] if plan else cadence.CADENCE['default_interval']
+
+def plan_next_refresh(data, previous_data):
+    """Plan when to pull this event's leaderboard again, from what changed since the previous snapshot."""
+    previous_field = Field(previous_data['leaderboard']) if previous_data else None
+    plan = cadence.plan_refresh(
+        data['tournament'], previous_field, Field(data['leaderboard']), (previous_data or {}).get('cadence')
+    )
+    logger.info(f"Next refresh of {data['tournament'].get('name')}: {plan['phase']}, in {plan['interval']}s")
+    return plan
+
+def set_cached_snapshot(data, last_updated, generation):
+    """Install a new snapshot in TOURNAMENT_CACHE and wake any clients waiting on a new generation."""
+    previous_data = TOURNAMENT_CACHE['data']
+    previous_field, previous_payouts = get_snapshot_field(previous_data) if previous_data else (None, {})
+    field, payouts = get_snapshot_field(data)
+    CHANGE_LOG.append({
+        'previous_generation': TOURNAMENT_CACHE['generation'],
+        'generation': generation,
+        'changes': diff_fields(previous_field, field),
+        # A tie forming or breaking elsewhere (or the purse arriving) moves a payout without touching the player's entry
+        'repriced': [key for key in payouts.keys() | previous_payouts.keys() if payouts.get(key) != previous_payouts.get(key)]
+    })
+    
+    # Rows for players who left the field will never be asked for again
+    for key in [key for key in ROW_CACHE if key not in field.by_key]:
+        del ROW_CACHE[key]
+    
+    TOURNAMENT_CACHE['data'] = data
+    TOURNAMENT_CACHE['last_updated'] = last_updated
+    TOURNAMENT_CACHE['cache_duration'] = get_refresh_interval(data)
+    # Every serialized view belongs to the old generation now
+    VIEW_CACHE.clear()
+    with GENERATION_CHANGED:
+        TOURNAMENT_CACHE['generation'] = generation
+        GENERATION_CHANGED.notify_all()
+
+def is_live_event_snapshot(data):
+    """Check a stored snapshot is of the event TOURNAMENT_CACHE tracks, not one left over from an earlier event."""
+    snapshot_id = (data or {}).get('tournament', {}).get('id')
+    if snapshot_id != TOURNAMENT_CACHE['tournament_id']:
+        logger.warning(f"Ignoring stored snapshot of tournament {snapshot_id}; tracking {TOURNAMENT_CACHE['tournament_id']}")
+        return False
+    return True
+
+def sync_from_backend():
+    """Pull a newer snapshot written by another worker into the local TOURNAMENT_CACHE."""
+    if CACHE_BACKEND.get_generation() <= TOURNAMENT_CACHE['generation']:
+        return
+    
+    snapshot = CACHE_BACKEND.load_snapshot()
+    if snapshot and not is_live_event_snapshot(snapshot['data']):
+        return
+    if snapshot and snapshot['generation'] > TOURNAMENT_CACHE['generation']:
+        set_cached_snapshot(snapshot['data'], snapshot['last_updated'], snapshot['generation'])
+        logger.info(f"Loaded cache generation {snapshot['generation']} from shared backend")
+
+def load_warm_start():
+    """Seed the cache from the last snapshot saved to disk, so a restart serves stale data instead of nothing."""
+    # A shared backend that already holds data (another worker is running) is fresher than the file
+    sync_from_backend()
+    if not TOURNAMENT_CACHE['data']:
+        snapshot = warm_start.load_snapshot()
+        if not snapshot or not is_live_event_snapshot(snapshot['data']):
+            return
         
-        # Only update if:
-        # 1. Cache is expired (10 minutes)
-        # 2. Current time is between 5am and 5pm PT
-        if time_since_update < TOURNAMENT_CACHE['cache_duration'] or current_hour < 5 or current_hour >= 17:
-            logger.info("Using cached data")
-            return TOURNAMENT_CACHE['data']
+        # Keep the original fetch time so the refresher still treats the data as due and revalidates it
+        generation = CACHE_BACKEND.store_snapshot(snapshot['data'], snapshot['last_updated'])
+        set_cached_snapshot(snapshot['data'], snapshot['last_updated'], generation)
+        logger.info(f"Warm start: loaded snapshot fetched at {datetime.fromtimestamp(snapshot['last_updated'])}")
     
-    logger.info("Forcing fresh data fetch...")
-    
-    year = 2025
-    tournament_id = TOURNAMENT_CACHE['tournament_id']
-    
-    # Get leaderboard data directly since we know the tournament ID
-    logger.info(f"Fetching leaderboard data for year {year} and tournament {tournament_id}")
-    leaderboard_data = fetch_tournament_leaderboard(year, tournament_id)
-    
-    if leaderboard_data:
-        logger.info("Successfully fetched fresh leaderboard data")
-        TOURNAMENT_CACHE['data'] = {
-            'tournament': {
-                'id': tournament_id,
-                'name': 'RBC Heritage',  # Fixed tournament name
-                'start_date': '2025-04-17',
-                'end_date': '2025-04-20',
-                'venue': {'name': 'Harbour Town Golf Links'},
-                'round': leaderboard_data.get('round', 1)
-            },
-            'leaderboard': leaderboard_data
-        }
-        TOURNAMENT_CACHE['last_updated'] = time.time()
-        return TOURNAMENT_CACHE['data']
-    else:
-        logger.error("Failed to fetch leaderboard data")
-        return None
+    # A stored plan saying the event closed is only trusted once a fetch in this process confirms it
+    if TOURNAMENT_CACHE['cache_duration'] is None:
+        TOURNAMENT_CACHE['cache_duration'] = cadence.CADENCE['default_interval']
 
-def get_projected_payout(position):
-    """Get the projected payout for a given position."""
-    if position == "CUT":
-        return "-"
+def refresh_tournament_data():
+    """Fetch fresh leaderboard data into the cache, returning the last good snapshot."""
+    if not REFRESH_LOCK.acquire(blocking=False):
+        # Another thread is already fetching; wait for it and share its result
+        with REFRESH_LOCK:
+            return TOURNAMENT_CACHE['data']
+    
     try:
-        # Handle tied positions (e.g., "T1")
-        if isinstance(position, str) and position.startswith('T'):
-            pos = int(position[1:])
-        else:
-            pos = int(position)
+        with CACHE_BACKEND.refresh_lock():
+            # Another worker may have refreshed while we waited for the lock
+            sync_from_backend()
+            if not is_refresh_due():
+                return TOURNAMENT_CACHE['data']
             
-        if pos in PAYOUT_STRUCTURE:
-            return PAYOUT_STRUCTURE[pos]  # Return raw number, let frontend handle formatting
-        return "-"
-    except (ValueError, TypeError):
-        return "-"
-
-def process_leaderboard_data(leaderboard_data):
-    """Process leaderboard data into a format suitable for the frontend."""
-    processed_data = {}
-    
-    if not leaderboard_data or 'leaderboard' not in leaderboard_data:
-        logger.warning("No leaderboard data available")
-        return processed_data
-        
-    logger.info("=== PROCESSING LEADERBOARD DATA ===")
-    for player in leaderboard_data.get('leaderboard', []):
-        name = f"{player.get('first_name', '')} {player.get('last_name', '')}"
-        logger.info(f"\nProcessing player: {name}")
-        logger.info(f"Raw player data: {json.dumps(player, indent=2)}")
-        
-        position = player.get('position', '-')
-        tied = player.get('tied', False)
-        score = player.get('score', 'E')
-        if score == 0:
-            score = 'E'
-        elif score is not None:
-            score = f"{'+' if score > 0 else ''}{score}"
-        
-        # Check if player is cut
-        status = player.get('status', '')
-        if status == 'CUT':
-            processed_data[name] = {
-                "position": "CUT",
-                "position_number": 9999 if not str(position).isdigit() else int(position),
-                "tied": False,  # Set tied to False for cut players
-                "score": score,
-                "today": "-",
-                "thru": "-",
-                "payout": "-"
-            }
-            continue
-        
-        # Get round information
-        rounds = player.get('rounds', [])
-        current_round = None
-        
-        # Find the current round (most recent round with sequence number)
-        for round_data in reversed(rounds):
-            if round_data.get('sequence') == len(rounds):
-                current_round = round_data
-                break
-        
-        # Initialize today and thru with default values
-        today = "-"
-        thru = "-"
-        
-        # Get today's score and thru
-        if current_round:
-            thru = current_round.get('thru', 0)
-            score_today = current_round.get('score', 0)
-            strokes_today = current_round.get('strokes', 0)
+            year = SEASON['year']
+            tournament_id = TOURNAMENT_CACHE['tournament_id']
+            previous = TOURNAMENT_CACHE['data'] or {}
+            summary_updated = previous.get('summary_updated')
+            include_summary = not summary_updated or time.time() - summary_updated >= TOURNAMENT_CACHE['summary_duration']
             
-            # Player hasn't started their round
-            if thru == 0 and score_today == 0 and strokes_today == 0:
-                thru = '-'
-                today = '-'
-            # Player has finished their round
-            elif thru == 18:
-                thru = 'F'
-                today = score_today
-                if today == 0:
-                    today = 'E'
-                elif today is not None:
-                    today = f"{'+' if today > 0 else ''}{today}"
-            # Player is in progress
-            else:
-                thru = str(thru)
-                today = score_today
-                if today == 0:
-                    today = 'E'
-                elif today is not None:
-                    today = f"{'+' if today > 0 else ''}{today}"
+            # Leaderboard and summary are independent, so they're fetched concurrently
+            logger.info(f"Fetching leaderboard data for year {year} and tournament {tournament_id}")
+            results = fetch_tournament_bundle(year, tournament_id, include_summary)
+            leaderboard_data = results.get('leaderboard')
+            summary = results.get('summary')
             
-            logger.info(f"Processing round data for {name}:")
-            logger.info(f"Raw round data: {json.dumps(current_round, indent=2)}")
-            logger.info(f"Processed today: {today}, thru: {thru}")
-        
-        processed_data[name] = {
-            "position": position,
-            "position_number": 9999 if not str(position).isdigit() else int(position),
-            "tied": tied,
+            if leaderboard_data:
+                logger.info("Successfully fetched fresh leaderboard data")
+                data = {
+                    'tournament': build_tournament_info(tournament_id, summary, leaderboard_data, previous.get('tournament')),
+                    'leaderboard': leaderboard_data,
+                    'summary_updated': time.time() if summary else summary_updated
+                }
+                data['cadence'] = plan_next_refresh(data, TOURNAMENT_CACHE['data'])
+                last_updated = time.time()
+                generation = CACHE_BACKEND.store_snapshot(data, last_updated)
+                set_cached_snapshot(data, last_updated, generation)
+                warm_start.save_snapshot(data, last_updated)
+                record_history(data, last_updated, generation)
+            else:
+                logger.error("Failed to fetch leaderboard data")
+            return TOURNAMENT_CACHE['data']
+    finally:
+        REFRESH_LOCK.release()
+
+def record_history(data, fetched_at, generation):
+    """Append a fetched snapshot to the history store, with a point for every player that changed."""
+    if HISTORY is None:
+        return
+    field = get_snapshot_field(data)[0]
+    changed = [field.lookup(change['player']) for change in CHANGE_LOG[-1]['changes'] if not change.get('removed')]
+    HISTORY.record_snapshot(
+        data['tournament']['id'],
+        generation, fetched_at, data['leaderboard'], [player for player in changed if player is not None]
+    )
+
+def get_cached_data():
+    """Get the last good tournament snapshot, only fetching inline when nothing is cached yet."""
+    # The background refresher keeps the cache current; without it, fall back to refreshing on demand
+    if not TOURNAMENT_CACHE['data'] or (REFRESHER['thread'] is None and is_refresh_due()):
+        CACHE_LOOKUPS.inc(result='miss')
+        return refresh_tournament_data()
+    CACHE_LOOKUPS.inc(result='hit')
+    return TOURNAMENT_CACHE['data']
+
+def get_season_schedule():
+    """Get the season schedule, re-pulling it once it's older than SEASON['schedule_duration']."""
+    updated = SEASON['schedule_updated']
+    if updated is None or time.time() - updated >= SEASON['schedule_duration']:
+        # A failed pull waits out the same interval, keeping whatever schedule we had
+        SEASON['schedule_updated'] = time.time()
+        SEASON['schedule'] = fetch_tournament_schedule(SEASON['year']) or SEASON['schedule']
+    return SEASON['schedule']
+
+def get_event_payouts(leaderboard_data, purse=None):
+    """Get every league's per-member winnings from one event's leaderboard, as {league: {member: amount}}."""
+    field = Field(leaderboard_data)
+    payouts = project_payouts(field.players, get_payout_table(purse))
+    return {league: standings.member_payouts(field, payouts, picks) for league, picks in LEAGUES.items()}
+
+def get_pending_events():
+    """List completed events on the season schedule that some league's standings haven't folded in yet."""
+    return [
+        event for event in standings.completed_events(get_season_schedule())
+        if not all(season.has_event(event.get('id')) for season in SEASON_STANDINGS.values())
+    ]
+
+def update_season_standings():
+    """Fold any newly completed events into the season standings, a few per call."""
+    # Its own lock, so a cold refresh of the live leaderboard never queues behind the backfill's fetches
+    with CACHE_BACKEND.refresh_lock('standings'):
+        # Another worker may already have folded them in
+        for season in SEASON_STANDINGS.values():
+            season.sync()
+        for event in get_pending_events()[:SEASON['backfill_per_poll']]:
+            # One fetch per event serves every league
+            leaderboard_data = fetch_tournament_leaderboard(SEASON['year'], event['id'])
+            if leaderboard_data and leaderboard_data.get('leaderboard'):
+                for league, payouts in get_event_payouts(leaderboard_data, event.get('purse')).items():
+                    SEASON_STANDINGS[league].add_event(event, payouts)
+
+def run_refresher():
+    """Keep TOURNAMENT_CACHE current in the background so requests never wait on SportsRadar."""
+    logger.info("Background refresher started")
+    while True:
+        try:
+            sample_memory_usage()
+            sync_from_backend()
+            if is_refresh_due():
+                refresh_tournament_data()
+            update_season_standings()
+        except Exception as e:
+            logger.error(f"Error in background refresh: {str(e)}")
+        # Wake exactly when the next pull is due, but keep checking at least every poll_interval
+        # (another worker may have refreshed, and a pull that just failed is retried on that interval)
+        remaining = seconds_until_refresh()
+        time.sleep(min(REFRESHER['poll_interval'], remaining) if remaining > 0 else REFRESHER['poll_interval'])
+
+def start_refresher():
+    """Start the background refresher thread if it isn't already running."""
+    if REFRESHER['thread'] is None:
+        REFRESHER['thread'] = threading.Thread(target=run_refresher, name='tournament-refresher', daemon=True)
+        REFRESHER['thread'].start()
+
+def is_entry_expired(entry):
+    """Check whether a registry entry needs fetching; finished events never expire."""
+    if entry['data'] is None:
+        return entry['last_attempt'] is None or time.time() - entry['last_attempt'] >= REGISTRY['retry_interval']
+    return entry['cache_duration'] is not None and time.time() - entry['last_updated'] >= entry['cache_duration']
+
+def refresh_registry_entry(entry):
+    """Fetch an event's leaderboard and details into its registry entry, keeping the old data on failure."""
+    entry['last_attempt'] = time.time()
+    results = fetch_tournament_bundle(entry['year'], entry['tournament_id'])
+    leaderboard_data = results.get('leaderboard')
+    if not leaderboard_data:
+        logger.error(f"Failed to fetch leaderboard for {entry['year']} tournament {entry['tournament_id']}")
+        return
+    
+    previous = entry['data'] or {}
+    data = {
+        'tournament': build_tournament_info(entry['tournament_id'], results.get('summary'), leaderboard_data, previous.get('tournament', {})),
+        'leaderboard': leaderboard_data,
+        'summary_updated': time.time()
+    }
+    data['cadence'] = plan_next_refresh(data, entry['data'])
+    entry['data'] = data
+    entry['last_updated'] = time.time()
+    # Results of a finished event are final (interval None), so it stays cached until evicted
+    entry['cache_duration'] = get_refresh_interval(data)
+    entry['views'] = {}
+    entry['generation'] += 1
+
+def get_registry_entry(year, tournament_id):
+    """Get the cache entry for any event, fetching it on first use or once its TTL lapses."""
+    key = (year, tournament_id)
+    with REGISTRY['lock']:
+        entry = REGISTRY['entries'].get(key)
+        if entry is None:
+            entry = {
+                'year': year,
+                'tournament_id': tournament_id,
+                'data': None,
+                'last_updated': None,
+                'last_attempt': None,
+                'cache_duration': cadence.CADENCE['default_interval'],
+                'generation': 0,
+                'views': {},
+                'lock': threading.Lock()
+            }
+            REGISTRY['entries'][key] = entry
+            while len(REGISTRY['entries']) > REGISTRY['max_entries']:
+                evicted, _ = REGISTRY['entries'].popitem(last=False)
+                logger.info(f"Evicted cache for {evicted[0]} tournament {evicted[1]}")
+        REGISTRY['entries'].move_to_end(key)
+    
+    # Single-flight per event, without holding up lookups of other events
+    with entry['lock']:
+        if is_entry_expired(entry):
+            refresh_registry_entry(entry)
+    return entry if entry['data'] else None
+
+def get_event_cache(year=None, tournament_id=None):
+    """Get the cache for an event: the live TOURNAMENT_CACHE by default, otherwise a registry entry."""
+    year = year or SEASON['year']
+    tournament_id = tournament_id or TOURNAMENT_CACHE['tournament_id']
+    if year == SEASON['year'] and tournament_id == TOURNAMENT_CACHE['tournament_id']:
+        return TOURNAMENT_CACHE if get_cached_data() else None
+    return get_registry_entry(year, tournament_id)
+
+def get_payout_table(purse=None):
+    """Get the payout table for a tournament's purse, scaling PAYOUT_STRUCTURE (built once per purse)."""
+    purse = purse or PAYOUT_BASE_PURSE
+    table = PAYOUT_TABLES.get(purse)
+    if table is None:
+        table = PayoutTable.from_structure(PAYOUT_STRUCTURE, purse / PAYOUT_BASE_PURSE, extend_to=PAYOUT_MAX_POSITIONS)
+        PAYOUT_TABLES[purse] = table
+    return table
+
+def format_to_par(score):
+    """Format a score relative to par, e.g. -3, E, +2."""
+    if score == 0:
+        return 'E'
+    if score is not None:
+        return f"{'+' if score > 0 else ''}{score}"
+    return score
+
+def get_field_entry(leaderboard_data, purse=None):
+    """Build the field model and its payout projections together, once per fetch and purse."""
+    key = (id(leaderboard_data), purse)
+    entries = FIELD_CACHE['entries']
+    with FIELD_CACHE['lock']:
+        entry = entries.get(key)
+        # The entry holds the payload, so its id can't be reused by another one while the entry exists
+        if entry is not None and entry[0] is leaderboard_data:
+            entries.move_to_end(key)
+            return entry[1], entry[2]
+    
+    field = Field(leaderboard_data)
+    # The whole field is projected in one pass so ties split the purse correctly
+    payouts = project_payouts(field.players, get_payout_table(purse))
+    with FIELD_CACHE['lock']:
+        entries[key] = (leaderboard_data, field, payouts)
+        while len(entries) > FIELD_CACHE['max_entries']:
+            entries.popitem(last=False)
+    return field, payouts
+
+def get_snapshot_field(cached_data):
+    """Get the field model and payouts for a cached snapshot, projected with that event's purse."""
+    return get_field_entry(cached_data['leaderboard'], cached_data['tournament'].get('purse'))
+
+def format_player(player, payout=None):
+    """Format a player from the field model into a row for the frontend."""
+    position = player.position
+    score = format_to_par(player.score)
+    number = position_number(position)
+    # Unplaced players (no position yet, WD, DQ) sort to the bottom
+    sort_number = 9999 if number is None else number
+    
+    # Check if player is cut
+    if player.status == 'CUT':
+        return {
+            "position": "CUT",
+            "position_number": sort_number,
+            "tied": False,  # Set tied to False for cut players
             "score": score,
-            "today": today,
-            "thru": thru,
-            "payout": get_projected_payout(position)
+            "today": "-",
+            "thru": "-",
+            "payout": "-"
         }
+    
+    # Initialize today and thru with default values
+    today = "-"
+    thru = "-"
+    
+    # Get today's score and thru
+    if player.has_round:
+        thru = player.round_thru
+        score_today = player.round_score
         
-        logger.info(f"Processed data for {name}: {json.dumps(processed_data[name], indent=2)}")
+        # Player hasn't started their round
+        if thru == 0 and score_today == 0 and player.round_strokes == 0:
+            thru = '-'
+            today = '-'
+        # Player has finished their round
+        elif thru == 18:
+            thru = 'F'
+            today = format_to_par(score_today)
+        # Player is in progress
+        else:
+            thru = str(thru)
+            today = format_to_par(score_today)
+    
+    return {
+        "position": position,
+        "position_number": sort_number,
+        "tied": player.tied,
+        "score": score,
+        "today": today,
+        "thru": thru,
+        "payout": payout or "-"  # Return raw number, let frontend handle formatting
+    }
+
+def get_player_row(player, payout=None):
+    """Get a player's formatted row, only reformatting when their feed entry or payout has changed."""
+    # A new tie elsewhere can change a player's payout without touching their own entry
+    signature = (player_signature(player), payout)
+    cached = ROW_CACHE.get(player.key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    row = format_player(player, payout)
+    ROW_CACHE[player.key] = (signature, row)
+    capture_player(player.name, player.raw, row)
+    return row
+
+def process_leaderboard_data(leaderboard_data, names=None, purse=None):
+    """Process leaderboard data into a format suitable for the frontend.
+    
+    Formats the whole field by default; pass `names` to format only those players (keyed by the name asked for).
+    Payouts are projected from `purse` (the event's, from its tournament details).
+    """
+    processed_data = {}
+    
+    if not leaderboard_data or 'leaderboard' not in leaderboard_data:
+        logger.warning("No leaderboard data available")
+        return processed_data
+    
+    field, payouts = get_field_entry(leaderboard_data, purse)
+    if names is None:
+        players = [(player.name, player) for player in field.players]
+    else:
+        players = [(name, field.lookup(name)) for name in names]
+    
+    for name, player in players:
+        if player is not None and name not in processed_data:
+            processed_data[name] = get_player_row(player, payouts.get(player.key))
     
     return processed_data
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_LATENCY.observe(time.perf_counter() - g.request_start, endpoint=endpoint)
+    if response.content_length is not None:
+        RESPONSE_SIZE.observe(response.content_length, endpoint=endpoint)
+    return response
+
+@app.route('/millerlite/metrics')
+def metrics():
+    # Without the refresher there's no periodic sample, so take one per scrape
+    if REFRESHER['thread'] is None:
+        sample_memory_usage()
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.template_global()
+def asset_url(filename):
+    """URL of a static file under its content hash, falling back to Flask's static route for unknown files."""
+    asset = ASSETS.get(filename)
+    if asset is None:
+        return url_for('static', filename=filename)
+    return url_for('serve_asset', filename=asset.hashed_path)
+
+def negotiated_response(variants, mimetype, etag, cache_control=None):
+    """Serve the best precomputed encoding the client accepts; nothing is compressed per request."""
+    encoding = request.accept_encodings.best_match([e for e in assets.ENCODINGS if e in variants], default='identity')
+    response = Response(variants[encoding], mimetype=mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(assets.encoded_etag(etag, encoding))
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    return response
+
+def not_modified_response(etag):
+    """A 304 carrying the validator the client sent, so it keeps its cached encoding."""
+    response = Response(status=304)
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    return response
+
+@app.route('/millerlite/assets/<path:filename>')
+def serve_asset(filename):
+    asset = ASSETS_BY_HASHED_PATH.get(filename)
+    if asset is None:
+        return Response(status=404)
+    # The URL changes whenever the content does, so browsers never need to revalidate
+    return negotiated_response(asset.variants, asset.mimetype, asset.etag, 'public, max-age=31536000, immutable')
+
+# Jinja versions of the page script's formatScore, formatThru and formatPayout, so server-rendered rows match
+@app.template_filter('format_score')
+def format_score_html(score):
+    if score == 'N/A' or score is None:
+        return 'N/A'
+    try:
+        number = int(str(score))
+    except ValueError:
+        return score
+    formatted = 'E' if number == 0 else f"+{number}" if number > 0 else str(number)
+    css_class = 'score-even' if number == 0 else 'score-under' if number < 0 else 'score-over'
+    return Markup(f'<span class="{css_class}">{formatted}</span>')
+
+@app.template_filter('format_thru')
+def format_thru_html(thru):
+    if thru == 'N/A' or thru is None:
+        return 'N/A'
+    if thru == 'F' or thru == 18:
+        return 'F'
+    return thru
+
+@app.template_filter('format_payout')
+def format_payout_html(payout):
+    if not payout or payout in ('-', 'N/A'):
+        return '-'
+    if isinstance(payout, str) and payout.startswith('$'):
+        return payout
+    try:
+        value = float(payout)
+    except ValueError:
+        return payout
+    # Divide in floats like the browser does, then round the exact result half up as toFixed() does
+    if value >= 1000000:
+        return f"${Decimal(value / 1000000).quantize(Decimal('0.1'), ROUND_HALF_UP)}m"
+    if value >= 1000:
+        return f"${Decimal(value / 1000).quantize(Decimal('1'), ROUND_HALF_UP)}k"
+    return f"${Decimal(value).quantize(Decimal('1'), ROUND_HALF_UP)}"
+
+def get_shell(league):
+    """Get the page for a league with the live leaderboard pre-rendered, rendering it once per cache generation."""
+    get_cached_data()
+    generation = TOURNAMENT_CACHE['generation']
+    fingerprint = f"{VIEW_FINGERPRINT}:{assets.get_manifest_fingerprint(ASSETS)}:{generation}"
+    entry = SHELL_CACHE.get(league)
+    if entry is None or entry['fingerprint'] != fingerprint:
+        leaderboard = hydration = None
+        if TOURNAMENT_CACHE['data']:
+            picks = LEAGUES[league]
+            view = get_cached_view(get_view_name('leaderboard', league), lambda cached_data: build_leaderboard_payload(cached_data, picks))
+            leaderboard = view['payload']
+            hydration = {
+                'generation': view['generation'],
+                'last_updated': TOURNAMENT_CACHE['last_updated'],
+                'payload': leaderboard
+            }
+        html = render_template(
+            'index.html',
+            members=LEAGUES[league],
+            league=league if league != DEFAULT_LEAGUE else None,
+            leaderboard=leaderboard,
+            hydration=hydration
+        )
+        body = html.encode('utf-8')
+        entry = {
+            'fingerprint': fingerprint,
+            'variants': assets.compress_variants(body),
+            'etag': hashlib.sha1(body).hexdigest()
+        }
+        SHELL_CACHE[league] = entry
+        logger.info(f"Rendered page for {league} at cache generation {generation}")
+    return entry
+
+def render_league_page():
+    league = request.args.get('league') or DEFAULT_LEAGUE
+    if league not in LEAGUES:
+        return unknown_league_response(league)
+    shell = get_shell(league)
+    matched = assets.matching_etag(request.if_none_match, shell['etag'])
+    if matched:
+        return not_modified_response(matched)
+    return negotiated_response(shell['variants'], 'text/html', shell['etag'], 'no-cache')
+
 @app.route('/')
 def index():
-    return render_template('index.html', members=LEAGUE_MEMBERS)
+    return render_league_page()
 
 @app.route('/millerlite')
 def millerlite():
-    return render_template('index.html', members=LEAGUE_MEMBERS)
+    return render_league_page()
 
-@app.route('/millerlite/api/tournaments/current')
-def get_current_tournament_info():
-    cached_data = get_cached_data()
-    
-    if not cached_data:
-        return jsonify({
-            "status": "error",
-            "message": "Unable to fetch tournament data"
-        })
-    
+def build_tournament_payload(cached_data):
+    """Build the /millerlite/api/tournaments/current response body."""
     tournament_info = cached_data['tournament']
-    return jsonify({
+    return {
         "status": "success",
         "data": {
             "id": tournament_info.get('id'),
@@ -419,54 +932,353 @@ def get_current_tournament_info():
             "venue": tournament_info.get('venue', {}),
             "round": tournament_info.get('round', 'N/A')
         }
-    })
+    }
+
+def build_league_data(processed_data, picks=LEAGUE_MEMBERS):
+    """Combine processed leaderboard data with league picks, sorted by position."""
+    league_data = {}
+    for member, player in picks.items():
+        if player in processed_data:
+            league_data[member] = {
+                "player": player,
+                "position_number": processed_data[player]["position_number"],
+                **processed_data[player]
+            }
+        else:
+            league_data[member] = {
+                "player": player,
+                "position": "N/A",
+                "position_number": 9999,
+                "tied": False,
+                "score": "N/A",
+                "today": "N/A",
+                "thru": "N/A",
+                "payout": "-"
+            }
+    
+    # Sort league data by position
+    return dict(sorted(
+        league_data.items(),
+        key=lambda x: x[1]["position_number"]
+    ))
+
+def build_leaderboard_payload(cached_data, picks=LEAGUE_MEMBERS):
+    """Build the full /millerlite/api/leaderboard response body."""
+    # Only the rostered golfers are formatted; the rest of the field is never touched
+    processed_data = process_leaderboard_data(
+        cached_data['leaderboard'], names=picks.values(), purse=cached_data['tournament'].get('purse')
+    )
+    return {
+        "status": "success",
+        "tournament": cached_data['tournament'],
+        "data": build_league_data(processed_data, picks)
+    }
+
+def build_odds_payload(cached_data, picks=LEAGUE_MEMBERS, seed=None):
+    """Build the /millerlite/api/odds response body from a Monte Carlo run over the rest of the event."""
+    field = get_snapshot_field(cached_data)[0]
+    table = get_payout_table(cached_data['tournament'].get('purse'))
+    start_time = time.perf_counter()
+    odds = simulate_league(field, picks, table, seed=seed)
+    logger.info(f"Simulated odds for {len(field)} players in {time.perf_counter() - start_time:.3f}s")
+    return {
+        "status": "success",
+        "tournament": cached_data['tournament'],
+        "data": dict(sorted(odds.items(), key=lambda x: -x[1]["pool_win_probability"]))
+    }
+
+def build_standings_payload(cached_data, league=DEFAULT_LEAGUE):
+    """Build the /millerlite/api/standings response body: memoized completed events plus the live one."""
+    tournament_info = cached_data['tournament']
+    season = SEASON_STANDINGS[league]
+    picks = LEAGUES[league]
+    field, payouts = get_snapshot_field(cached_data)
+    live_payouts = standings.member_payouts(field, payouts, picks)
+    return {
+        "status": "success",
+        "year": SEASON['year'],
+        "league": league,
+        "live_tournament": tournament_info,
+        "events": [
+            {"id": tournament_id, "name": event['name'], "end_date": event['end_date']}
+            for tournament_id, event in sorted(season.events.items(), key=lambda x: x[1]['end_date'] or '')
+        ],
+        "data": season.standings(picks, tournament_info.get('id'), live_payouts)
+    }
+
+def get_int_arg(args, name, minimum=0):
+    """Read an optional integer query argument, raising ValueError for anything that isn't one."""
+    value = args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if number < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return number
+
+def parse_field_query(args):
+    """Read /millerlite/api/field arguments into a canonical query, so equivalent requests share a view."""
+    cut = args.get('cut') or None
+    if cut is not None and cut not in FIELD_QUERY['cut_values']:
+        raise ValueError(f"cut must be one of {', '.join(FIELD_QUERY['cut_values'])}")
+    
+    columns = FIELD_QUERY['columns']
+    requested = [name.strip() for name in (args.get('fields') or '').split(',') if name.strip()]
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    
+    limit = get_int_arg(args, 'limit', minimum=1)
+    return {
+        'top': get_int_arg(args, 'top', minimum=1),
+        'pos_min': get_int_arg(args, 'pos_min', minimum=1),
+        'pos_max': get_int_arg(args, 'pos_max', minimum=1),
+        'cut': cut,
+        'q': normalize_name(args.get('q')),
+        'fields': tuple(name for name in columns if name in requested) if requested else columns,
+        'limit': min(limit or FIELD_QUERY['default_limit'], FIELD_QUERY['max_limit']),
+        'offset': get_int_arg(args, 'offset') or 0
+    }
+
+def get_field_view_name(query):
+    """Name the view for a field query; the canonical query is part of the name (and so of the ETag)."""
+    parts = [f"{key}={value}" for key, value in query.items() if key != 'fields' and value not in (None, '')]
+    return f"field:{'&'.join(parts)}&fields={','.join(query['fields'])}"
+
+def matches_field_query(player, query):
+    """Apply the cut and position filters of a field query to one player."""
+    active = player.status not in UNPAID_STATUSES
+    if query['cut'] == 'missed' and player.status != 'CUT':
+        return False
+    # Before the cut is made, everyone still playing counts as having made it
+    if query['cut'] == 'made' and not active:
+        return False
+    if query['top'] is None and query['pos_min'] is None and query['pos_max'] is None:
+        return True
+    # Position ranges only cover players still in the event; cut and withdrawn players have no place to rank
+    number = position_number(player.position)
+    if not active or number is None:
+        return False
+    if query['top'] is not None and number > query['top']:
+        return False
+    if query['pos_min'] is not None and number < query['pos_min']:
+        return False
+    return query['pos_max'] is None or number <= query['pos_max']
+
+def build_field_payload(cached_data, query):
+    """Build a /millerlite/api/field response body: the matching players in leaderboard order, one page of them."""
+    field, payouts = get_snapshot_field(cached_data)
+    players = field.search(query['q']) if query['q'] else field.players
+    matched = [player for player in players if matches_field_query(player, query)]
+    page = matched[query['offset']:query['offset'] + query['limit']]
+    # Only the page is formatted, so a top-10 request never touches the other 146 rows
+    rows = []
+    for player in page:
+        row = {"player": player.name, **get_player_row(player, payouts.get(player.key)), "status": player.status}
+        rows.append({name: row[name] for name in query['fields']})
+    return {
+        "status": "success",
+        "tournament": cached_data['tournament'],
+        "total": len(matched),
+        "offset": query['offset'],
+        "limit": query['limit'],
+        "data": rows
+    }
+
+def trim_field_views(cache):
+    """Keep at most FIELD_QUERY['max_views'] field query views for the current generation, dropping the oldest."""
+    views = VIEW_CACHE if cache is TOURNAMENT_CACHE else cache['views']
+    names = [name for name in views if name.startswith('field:')]
+    for name in names[:max(0, len(names) - FIELD_QUERY['max_views'] + 1)]:
+        views.pop(name, None)
+
+# Fingerprint of the config baked into derived views, so a deploy with new picks never reuses an ETag
+VIEW_FINGERPRINT = hashlib.sha1(json.dumps([LEAGUES, PAYOUT_STRUCTURE], sort_keys=True).encode('utf-8')).hexdigest()
+
+def get_log_since(since):
+    """Collect CHANGE_LOG entries from generation `since` to the current one (oldest first), or None if the log doesn't reach back that far."""
+    entries = []
+    generation = TOURNAMENT_CACHE['generation']
+    for entry in reversed(CHANGE_LOG):
+        if generation == since:
+            break
+        if entry['generation'] != generation:
+            return None
+        entries.append(entry)
+        generation = entry['previous_generation']
+    if generation != since:
+        return None
+    return entries[::-1]
+
+def build_leaderboard_delta(cached_data, since, scope='roster', league=DEFAULT_LEAGUE):
+    """Build a /millerlite/api/leaderboard?since=<generation> body with only what changed."""
+    entries = get_log_since(since)
+    changes = merge_changes(entry['changes'] for entry in entries)
+    picks = LEAGUES[league]
+    league = get_cached_view(get_view_name('leaderboard', league), lambda cached_data: build_leaderboard_payload(cached_data, picks))['payload']
+    picked = {normalize_name(player) for player in picks.values()}
+    rostered_changes = [change for change in changes if normalize_name(change['player']) in picked]
+    # A member's row changes when their golfer's entry does or when their projected payout moves
+    changed_keys = {normalize_name(change['player']) for change in rostered_changes}
+    changed_keys.update(key for entry in entries for key in entry['repriced'] if key in picked)
+    return {
+        "status": "success",
+        "since": since,
+        "generation": TOURNAMENT_CACHE['generation'],
+        "tournament": cached_data['tournament'],
+        "data": {member: row for member, row in league['data'].items() if normalize_name(row['player']) in changed_keys},
+        "changes": changes if scope == 'field' else rostered_changes
+    }
+
+def get_view_name(name, league=DEFAULT_LEAGUE):
+    """Name a view for one league; the default league keeps the bare name."""
+    return name if league == DEFAULT_LEAGUE else f"{name}:{league}"
+
+def get_view_etag(name, cache, generation, last_updated):
+    """Derive a strong ETag for a view from the event and cache generation it was built from."""
+    tag = f"{name}:{cache['tournament_id']}:{generation}:{last_updated}:{VIEW_FINGERPRINT}"
+    return hashlib.sha1(tag.encode('utf-8')).hexdigest()
+
+def get_view_kind(name):
+    """Map a view name to one of VIEW_KINDS (longest prefix first), so metric labels stay bounded."""
+    return next((kind for kind in VIEW_KINDS if name.startswith(kind)), 'other')
+
+def get_cached_view(name, builder, cache=TOURNAMENT_CACHE, etag_name=None):
+    """Get a serialized view of an event's cached data, rebuilding it only when its generation changes.
+    
+    Views that only differ in how much of one state they send (deltas) pass the `etag_name` of that state.
+    """
+    views = VIEW_CACHE if cache is TOURNAMENT_CACHE else cache['views']
+    # Read the generation before the data so a view is never labelled newer than what it was built from
+    generation = cache['generation']
+    entry = views.get(name)
+    if entry and entry['generation'] == generation:
+        VIEW_LOOKUPS.inc(view=get_view_kind(name), result='hit')
+        return entry
+    
+    VIEW_LOOKUPS.inc(view=get_view_kind(name), result='miss')
+    last_updated = cache['last_updated']
+    payload = builder(cache['data'])
+    body = app.json.dumps(payload).encode('utf-8')
+    entry = {
+        'generation': generation,
+        'payload': payload,
+        'body': body,
+        # Compressed once here, so every request for this generation is served straight from memory
+        'variants': assets.compress_variants(body),
+        'etag': get_view_etag(etag_name or name, cache, generation, last_updated)
+    }
+    views[name] = entry
+    logger.info(f"Rebuilt {name} view for cache generation {generation}")
+    return entry
+
+def set_cache_headers(response, cache=TOURNAMENT_CACHE):
+    """Attach Last-Modified, the generation and a max-age matching the time left before the next refresh."""
+    last_updated = cache['last_updated']
+    if cache['cache_duration'] is None:
+        remaining = REGISTRY['closed_max_age']
+    else:
+        remaining = cache['cache_duration'] - (time.time() - last_updated)
+    response.headers['X-Cache-Generation'] = str(cache['generation'])
+    response.last_modified = datetime.fromtimestamp(last_updated, pytz.utc)
+    response.cache_control.max_age = max(0, int(remaining))
+    return response
+
+def cached_view_response(name, builder, cache=TOURNAMENT_CACHE, etag_name=None):
+    """Serve a cached view, answering conditional requests with a 304 before any processing."""
+    etag = get_view_etag(etag_name or name, cache, cache['generation'], cache['last_updated'])
+    matched = assets.matching_etag(request.if_none_match, etag)
+    if matched:
+        return set_cache_headers(not_modified_response(matched), cache)
+    
+    view = get_cached_view(name, builder, cache, etag_name)
+    return set_cache_headers(negotiated_response(view['variants'], 'application/json', view['etag']), cache)
+
+def is_known_request_event():
+    """Check ?year=&tournament= name the live event or one on the cached season schedule, so nothing else is ever fetched."""
+    year = request.args.get('year', type=int) or SEASON['year']
+    tournament_id = request.args.get('tournament') or TOURNAMENT_CACHE['tournament_id']
+    if year != SEASON['year']:
+        return False
+    if tournament_id == TOURNAMENT_CACHE['tournament_id']:
+        return True
+    return any(event.get('id') == tournament_id for event in (get_season_schedule() or {}).get('tournaments', []))
+
+def unknown_event_response():
+    return jsonify({
+        "status": "error",
+        "message": f"Unknown tournament: {request.args.get('year') or SEASON['year']} {request.args.get('tournament') or TOURNAMENT_CACHE['tournament_id']}"
+    }), 404
+
+def get_request_cache():
+    """Get the cache for the event named by ?year=&tournament=, defaulting to the live one."""
+    return get_event_cache(request.args.get('year', type=int), request.args.get('tournament'))
+
+def get_request_league():
+    """Get the league named by ?league=, defaulting to DEFAULT_LEAGUE; None if it isn't configured."""
+    league = request.args.get('league') or DEFAULT_LEAGUE
+    return league if league in LEAGUES else None
+
+def unknown_league_response(league=None):
+    return jsonify({
+        "status": "error",
+        "message": f"Unknown league: {league or request.args.get('league')}"
+    }), 404
+
+@app.route('/millerlite/api/tournaments/current')
+def get_current_tournament_info():
+    if not is_known_request_event():
+        return unknown_event_response()
+    
+    cache = get_request_cache()
+    
+    if not cache:
+        return jsonify({
+            "status": "error",
+            "message": "Unable to fetch tournament data"
+        })
+    
+    return cached_view_response('tournament', build_tournament_payload, cache)
 
 @app.route('/millerlite/api/leaderboard')
 def get_leaderboard():
     try:
-        cached_data = get_cached_data()
+        league = get_request_league()
+        if league is None:
+            return unknown_league_response()
+        
+        if not is_known_request_event():
+            return unknown_event_response()
         
-        if not cached_data:
+        cache = get_request_cache()
+        
+        if not cache:
             return jsonify({
                 "status": "error",
                 "message": "Unable to fetch tournament data"
             })
         
-        # Process leaderboard data
-        processed_data = process_leaderboard_data(cached_data['leaderboard'])
-        
-        # Process league members data
-        league_data = {}
-        for member, player in LEAGUE_MEMBERS.items():
-            if player in processed_data:
-                league_data[member] = {
-                    "player": player,
-                    "position_number": processed_data[player]["position_number"],
-                    **processed_data[player]
-                }
-            else:
-                league_data[member] = {
-                    "player": player,
-                    "position": "N/A",
-                    "position_number": 9999,
-                    "tied": False,
-                    "score": "N/A",
-                    "today": "N/A",
-                    "thru": "N/A",
-                    "payout": "-"
-                }
-        
-        # Sort league data by position
-        sorted_league_data = dict(sorted(
-            league_data.items(),
-            key=lambda x: x[1]["position_number"]
-        ))
+        picks = LEAGUES[league]
+        # Clients that know their generation get just the changes, if the log still covers it (live event only)
+        since = request.args.get('since', type=int)
+        if cache is TOURNAMENT_CACHE and since is not None and get_log_since(since) is not None:
+            scope = 'field' if request.args.get('scope') == 'field' else 'roster'
+            # Tagged as the league table of the current generation: a client that has caught up to it (by any
+            # route, full or delta) gets a 304 until the next refresh, whichever generation it asks from
+            return cached_view_response(
+                get_view_name(f'leaderboard-since-{since}-{scope}', league),
+                lambda cached_data: build_leaderboard_delta(cached_data, since, scope, league),
+                etag_name=get_view_name('leaderboard', league)
+            )
         
-        return jsonify({
-            "status": "success",
-            "tournament": cached_data['tournament'],
-            "data": sorted_league_data
-        })
+        return cached_view_response(
+            get_view_name('leaderboard', league),
+            lambda cached_data: build_leaderboard_payload(cached_data, picks),
+            cache
+        )
         
     except Exception as e:
         logger.error(f"Error in get_leaderboard: {str(e)}")
@@ -475,5 +1287,227 @@ def get_leaderboard():
             "message": f"Server error: {str(e)}"
         })
 
+def format_sse(event, data, event_id=None):
+    """Format a single Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+def diff_league_data(previous, current):
+    """Get the per-member fields that changed between two league tables."""
+    changes = {}
+    for member, row in current.items():
+        old_row = previous.get(member, {})
+        changed = {field: row.get(field) for field in STREAM['diff_fields'] if row.get(field) != old_row.get(field)}
+        if changed:
+            changes[member] = changed
+    return changes
+
+def get_stream_events(league=DEFAULT_LEAGUE):
+    """Get a league's SSE snapshot and delta events for the current cache generation, built once per generation."""
+    with STREAM_LOCK:
+        state = STREAM_STATES.setdefault(league, {
+            'previous_generation': None,
+            'generation': None,
+            'league': None,
+            'snapshot': None,
+            'delta': None
+        })
+        generation = TOURNAMENT_CACHE['generation']
+        if state['generation'] == generation:
+            return state
+        
+        picks = LEAGUES[league]
+        view = get_cached_view(get_view_name('leaderboard', league), lambda cached_data: build_leaderboard_payload(cached_data, picks))
+        league_data = view['payload']['data']
+        delta = None
+        if state['league'] is not None:
+            delta = format_sse('delta', app.json.dumps({
+                "previous_generation": state['generation'],
+                "generation": generation,
+                "tournament": view['payload']['tournament'],
+                "changes": diff_league_data(state['league'], league_data)
+            }), generation)
+        
+        state.update({
+            'previous_generation': state['generation'],
+            'generation': generation,
+            'league': league_data,
+            'snapshot': format_sse('snapshot', view['body'].decode('utf-8'), generation),
+            'delta': delta
+        })
+        return state
+
+def generate_leaderboard_stream(league=DEFAULT_LEAGUE, sent_generation=None):
+    """Yield a full snapshot (unless the client already has `sent_generation`), then a delta per new generation."""
+    yield f"retry: {STREAM['retry']}\n\n".encode('utf-8')
+    
+    while True:
+        with GENERATION_CHANGED:
+            changed = GENERATION_CHANGED.wait_for(
+                lambda: TOURNAMENT_CACHE['data'] and TOURNAMENT_CACHE['generation'] != sent_generation,
+                timeout=STREAM['heartbeat_interval']
+            )
+        if not changed:
+            yield b": keep-alive\n\n"
+            continue
+        
+        events = get_stream_events(league)
+        # A client that missed a generation can't apply the delta, so resend the whole table
+        if events['delta'] is not None and events['previous_generation'] == sent_generation:
+            yield events['delta']
+        else:
+            yield events['snapshot']
+        sent_generation = events['generation']
+
+@app.route('/millerlite/api/odds')
+def get_odds():
+    league = get_request_league()
+    if league is None:
+        return unknown_league_response()
+    
+    if not is_known_request_event():
+        return unknown_event_response()
+    
+    cache = get_request_cache()
+    
+    if not cache:
+        return jsonify({
+            "status": "error",
+            "message": "Unable to fetch tournament data"
+        })
+    
+    picks = LEAGUES[league]
+    # Seeding with the generation keeps every worker's odds identical for the same snapshot
+    seed = cache['generation']
+    return cached_view_response(
+        get_view_name('odds', league),
+        lambda cached_data: build_odds_payload(cached_data, picks, seed),
+        cache
+    )
+
+@app.route('/millerlite/api/standings')
+def get_standings():
+    league = get_request_league()
+    if league is None:
+        return unknown_league_response()
+    
+    cached_data = get_cached_data()
+    
+    if not cached_data:
+        return jsonify({
+            "status": "error",
+            "message": "Unable to fetch tournament data"
+        })
+    
+    # Without the refresher nothing else folds in completed events, so backfill them on demand
+    if REFRESHER['thread'] is None and get_pending_events():
+        try:
+            update_season_standings()
+        except Exception as e:
+            logger.error(f"Error updating season standings: {str(e)}")
+    
+    # The season version is part of the view name, so folding in an event changes the ETag mid-generation
+    return cached_view_response(
+        get_view_name(f'standings-{SEASON_STANDINGS[league].version}', league),
+        lambda cached_data: build_standings_payload(cached_data, league)
+    )
+
+@app.route('/millerlite/api/field')
+def get_field_query():
+    try:
+        query = parse_field_query(request.args)
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+    
+    if not is_known_request_event():
+        return unknown_event_response()
+    
+    cache = get_request_cache()
+    
+    if not cache:
+        return jsonify({
+            "status": "error",
+            "message": "Unable to fetch tournament data"
+        })
+    
+    name = get_field_view_name(query)
+    views = VIEW_CACHE if cache is TOURNAMENT_CACHE else cache['views']
+    if name not in views:
+        trim_field_views(cache)
+    return cached_view_response(name, lambda cached_data: build_field_payload(cached_data, query), cache)
+
+def history_response(label, name):
+    """Serve one golfer's position/score series for the current (or ?tournament=) event."""
+    if HISTORY is None:
+        return jsonify({
+            "status": "error",
+            "message": "History is disabled"
+        }), 404
+    
+    tournament_id = request.args.get('tournament') or TOURNAMENT_CACHE['tournament_id']
+    points = HISTORY.player_series(
+        tournament_id,
+        normalize_name(name),
+        request.args.get('start', type=float),
+        request.args.get('end', type=float)
+    )
+    return jsonify({
+        "status": "success",
+        "tournament_id": tournament_id,
+        **label,
+        "points": points
+    })
+
+@app.route('/millerlite/api/history/player/<path:name>')
+def get_player_history(name):
+    return history_response({"player": name}, name)
+
+@app.route('/millerlite/api/history/member/<path:member>')
+def get_member_history(member):
+    league = get_request_league()
+    if league is None:
+        return unknown_league_response()
+    
+    player = LEAGUES[league].get(member)
+    if player is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown league member: {member}"
+        }), 404
+    return history_response({"member": member, "player": player}, player)
+
+@app.route('/millerlite/api/leaderboard/stream')
+def stream_leaderboard():
+    league = get_request_league()
+    if league is None:
+        return unknown_league_response()
+    
+    # Make sure there's something to send; the refresher drives every update after this
+    get_cached_data()
+    # Reconnects carry the last event seen; a first connect from a hydrated page says which generation it shows
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+    response = Response(generate_leaderboard_stream(league, since), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+start_debug_capture()
+load_warm_start()
+
+# gunicorn imports the module; under `python app.py` only the reloader child starts the refresher
+if REFRESHER['enabled'] and __name__ != '__main__':
+    start_refresher()
+
 if __name__ == '__main__':
+    if REFRESHER['enabled'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_refresher()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5002)), debug=True) 
\ No newline at end of file
@@ -0,0 +1,87 @@
+import os
+import gzip
+import hashlib
+import logging
+import mimetypes
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip variants are kept
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Compression levels: assets and the page shell are compressed once, so they get the slowest, smallest settings
+COMPRESSION = {
+    'static': {'gzip': 9, 'br': 11},
+    'dynamic': {'gzip': 6, 'br': 5}
+}
+
+# A variant has to save at least this fraction of the bytes to be worth sending (PNGs are already compressed)
+MIN_SAVING = 0.1
+
+# Encodings in server preference order, for ties in the client's Accept-Encoding
+ENCODINGS = ('br', 'gzip', 'identity')
+
+
+def compress_variants(body, profile='dynamic'):
+    """Precompute the encodings of a body worth serving, as {encoding: bytes}."""
+    levels = COMPRESSION[profile]
+    variants = {'identity': body}
+    # mtime=0 keeps the gzip bytes (and so their ETag) identical across workers and restarts
+    candidates = {'gzip': gzip.compress(body, compresslevel=levels['gzip'], mtime=0)}
+    if brotli is not None:
+        candidates['br'] = brotli.compress(body, quality=levels['br'])
+    for encoding, data in candidates.items():
+        if len(data) <= len(body) * (1 - MIN_SAVING):
+            variants[encoding] = data
+    return variants
+
+
+def encoded_etag(etag, encoding):
+    """ETag of one encoding of a resource; each representation gets its own so caches never mix them up."""
+    return etag if encoding == 'identity' else f"{etag}-{encoding}"
+
+
+def matching_etag(if_none_match, etag):
+    """Find which of a resource's per-encoding ETags an If-None-Match header holds, or None."""
+    for encoding in ENCODINGS:
+        tag = encoded_etag(etag, encoding)
+        if tag in if_none_match:
+            return tag
+    return None
+
+
+class Asset:
+    """One static file, with a content-hashed URL path and its encodings precomputed."""
+
+    __slots__ = ('path', 'hashed_path', 'mimetype', 'variants', 'etag')
+
+    def __init__(self, path, body):
+        digest = hashlib.sha1(body).hexdigest()
+        base, extension = os.path.splitext(path)
+        self.path = path
+        self.hashed_path = f"{base}.{digest[:12]}{extension}"
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.variants = compress_variants(body, 'static')
+        self.etag = digest
+
+
+def build_manifest(static_folder):
+    """Hash and precompress every file under the static folder, as {relative path: Asset}."""
+    manifest = {}
+    for directory, _, filenames in os.walk(static_folder):
+        for filename in filenames:
+            full_path = os.path.join(directory, filename)
+            path = os.path.relpath(full_path, static_folder).replace(os.sep, '/')
+            try:
+                with open(full_path, 'rb') as asset_file:
+                    manifest[path] = Asset(path, asset_file.read())
+            except OSError as e:
+                logger.error(f"Error loading static asset {path}: {str(e)}")
+    return manifest
+
+
+def get_manifest_fingerprint(manifest):
+    """Fingerprint of every asset's content, so anything that embeds asset URLs changes when one does."""
+    return hashlib.sha1(''.join(sorted(asset.hashed_path for asset in manifest.values())).encode('utf-8')).hexdigest()
@@ -0,0 +1,382 @@
+import os
+import io
+import gc
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+
+# Benchmarks run against an in-process app with no refresher and nothing written to disk
+for name, value in (
+    ('DISABLE_REFRESHER', '1'), ('HISTORY_PATH', ''), ('STANDINGS_PATH', ''), ('SNAPSHOT_PATH', ''), ('RESPONSE_CACHE_PATH', '')
+):
+    os.environ.setdefault(name, value)
+
+import psutil
+
+import app
+import feed
+from field import Field
+from payouts import project_payouts
+from standin import SyntheticTournament, Recordings
+
+BENCH = {
+    'players': (78, 156, 312),  # Synthetic field sizes
+    'clock': 2.5 * 86400,  # Synthetic tournament time benchmarked: round 3 under way, so the cut and every column are in play
+    'frames': 12,  # Synthetic snapshots per field size, cycled through by the load test
+    'frame_interval': 600,  # Tournament seconds between synthetic snapshots
+    'repeat': 50,  # Samples per microbenchmark
+    'min_sample': 0.002,  # Seconds a microbenchmark sample should take at least; quicker stages are run several times per sample
+    'clients': 8,  # Concurrent load-test clients
+    'requests': 200,  # Requests per load-test client
+    'refresh_every': 200,  # Requests between new snapshots during the load test, so views keep being rebuilt
+    'endpoints': (
+        '/millerlite/api/leaderboard',
+        '/millerlite/api/tournaments/current',
+        '/millerlite/api/standings',
+        '/millerlite'
+    ),
+    'baseline_path': os.getenv('BENCH_BASELINE', 'bench_baseline.json'),
+    # Fractional slowdown (or throughput drop) against the baseline that counts as a regression; the load test
+    # shares the CPU with its own clients, so it gets more room, and its tail (requests queued behind a view
+    # rebuild) the most
+    'tolerance': 0.25,
+    'load_tolerance': 0.5,
+    'tail_tolerance': 1.0
+}
+
+# Metrics where bigger is better; everything else is a time or a size
+HIGHER_IS_BETTER = ('throughput_rps',)
+
+# Metrics checked against the baseline: a stage's best run (its median and p99 move with whatever else the machine
+# is doing) and the load test's overall figures (per-endpoint ones rest on a handful of samples)
+GATED_MICRO = ('min_ms',)
+GATED_LOAD = ('throughput_rps', 'p50_ms', 'p99_ms', 'peak_rss_mb')
+
+PROCESS = psutil.Process()
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(fn, repeat, setup=None):
+    """Run fn `repeat` times (after setup, which isn't timed) and return its best, median and p99 in milliseconds.
+
+    Without a setup, fast calls are batched (like timeit's autorange) so each sample is well above timer resolution.
+    """
+    number = 1
+    if setup is None:
+        start = time.perf_counter()
+        fn()
+        number = max(1, int(BENCH['min_sample'] / max(time.perf_counter() - start, 1e-7)))
+    times = []
+    gc.collect()
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return {'min_ms': min(times), 'median_ms': percentile(times, 0.5), 'p99_ms': percentile(times, 0.99)}
+
+
+def synthetic_feeds(sizes):
+    """Synthetic events as {label: (year, tournament_id, summary, [leaderboard payloads])}, one per field size."""
+    feeds = {}
+    for players in sizes:
+        source = SyntheticTournament(app.SEASON['year'], app.TOURNAMENT_CACHE['tournament_id'], players)
+        clocks = [BENCH['clock'] + index * BENCH['frame_interval'] for index in range(BENCH['frames'])]
+        feeds[f"synthetic-{players}"] = (
+            source.year, source.tournament_id, source.summary(BENCH['clock']),
+            [source.leaderboard(clock) for clock in clocks]
+        )
+    return feeds
+
+
+def recorded_feeds(directory):
+    """Recorded events as {label: (year, tournament_id, summary, [leaderboard payloads])}, one per recorded leaderboard timeline."""
+    recordings = Recordings(directory)
+    feeds = {}
+    for year in sorted(os.listdir(directory)):
+        tournaments = os.path.join(directory, year, 'tournaments')
+        if not year.isdigit() or not os.path.isdir(tournaments):
+            continue
+        for tournament_id in sorted(os.listdir(tournaments)):
+            path = f"{year}/tournaments/{tournament_id}/leaderboard.json"
+            frames = []
+            for _, filename in recordings.get_timeline(path):
+                with open(filename, 'rb') as body_file:
+                    frames.append(json.load(body_file))
+            if not frames:
+                continue
+            summary = recordings.load(f"{year}/tournaments/{tournament_id}/summary.json", 0)
+            feeds[f"recorded-{tournament_id[:8]}-{len(frames[-1].get('leaderboard', []))}"] = (
+                int(year), tournament_id, json.loads(summary) if summary else None, frames
+            )
+    return feeds
+
+
+def install_frame(year, tournament_id, summary, leaderboard_data):
+    """Make a leaderboard the live snapshot, as a refresh would (minus the fetch)."""
+    app.SEASON['year'] = year
+    # A fresh, empty schedule, so the standings view has nothing to backfill and never reaches for the network
+    app.SEASON['schedule'] = {'tournaments': []}
+    app.SEASON['schedule_updated'] = time.time()
+    app.TOURNAMENT_CACHE['tournament_id'] = tournament_id
+    data = {
+        'tournament': app.build_tournament_info(tournament_id, summary, leaderboard_data, app.TOURNAMENT_DEFAULTS),
+        'leaderboard': leaderboard_data,
+        'summary_updated': time.time(),
+        # Never due, so nothing in the benchmark reaches for the network
+        'cadence': {'phase': 'bench', 'interval': None, 'quiet_polls': 0, 'round_done': None}
+    }
+    last_updated = time.time()
+    generation = app.CACHE_BACKEND.store_snapshot(data, last_updated)
+    app.set_cached_snapshot(data, last_updated, generation)
+
+
+def reset_derived_caches():
+    app.FIELD_CACHE['entries'].clear()
+    app.ROW_CACHE.clear()
+
+
+def run_microbenchmarks(year, tournament_id, summary, frames, repeat):
+    """Time each stage of building the leaderboard response in isolation, from a cold cache."""
+    # The raw body is what gets parsed; the app only ever holds the compact payload parsing leaves
+    body = json.dumps(frames[0]).encode('utf-8')
+    leaderboard_data = feed.compact_leaderboard(frames[0])
+    picks = app.LEAGUES[app.DEFAULT_LEAGUE]
+    results = {}
+
+    results['parse'] = measure(lambda: feed.parse_leaderboard(io.BytesIO(body)), repeat)
+    results['process_field'] = measure(lambda: app.process_leaderboard_data(leaderboard_data), repeat, reset_derived_caches)
+    results['process_roster'] = measure(
+        lambda: app.process_leaderboard_data(leaderboard_data, names=picks.values()), repeat, reset_derived_caches
+    )
+
+    # The whole field's payouts in the one pass get_field_entry makes, ties split across the places they share
+    players = Field(leaderboard_data).players
+    table = app.get_payout_table((summary or {}).get('purse'))
+    results['project_payouts'] = measure(lambda: project_payouts(players, table), repeat)
+
+    processed = app.process_leaderboard_data(leaderboard_data, names=picks.values())
+    results['league_assembly'] = measure(lambda: app.build_league_data(processed, picks), repeat)
+
+    install_frame(year, tournament_id, summary, leaderboard_data)
+    payload = app.build_leaderboard_payload(app.TOURNAMENT_CACHE['data'], picks)
+    field_rows = app.process_leaderboard_data(leaderboard_data)
+    results['serialize_league'] = measure(lambda: app.json.dumps(payload), repeat)
+    results['serialize_field'] = measure(lambda: app.json.dumps(field_rows), repeat)
+    return results
+
+
+def run_load_test(feed_entry, clients, requests_per_client, base_url=None):
+    """Hammer the endpoints from concurrent clients while new snapshots keep arriving; report throughput, latency and RSS."""
+    year, tournament_id, summary, frames = feed_entry
+    frames = [feed.compact_leaderboard(frame) for frame in frames]
+    if base_url is None:
+        install_frame(year, tournament_id, summary, frames[0])
+    latencies = {endpoint: [] for endpoint in BENCH['endpoints']}
+    errors = Counter()
+    done = threading.Event()
+    peak_rss = [PROCESS.memory_info().rss]
+
+    def churn():
+        # Refreshes landing mid-test, as in production, so views are rebuilt under load; paced by request count
+        # rather than time so every run rebuilds the same number of times
+        installed = 0
+        while not done.wait(0.005):
+            due = sum(len(values) for values in latencies.values()) // BENCH['refresh_every']
+            if due > installed:
+                installed = due
+                install_frame(year, tournament_id, summary, frames[installed % len(frames)])
+
+    def sample_rss():
+        while not done.wait(0.05):
+            peak_rss[0] = max(peak_rss[0], PROCESS.memory_info().rss)
+
+    def client(offset):
+        if base_url is None:
+            session = app.app.test_client()
+            get = lambda path: session.get(path, headers={'Accept-Encoding': 'br, gzip'})
+        else:
+            import requests
+            session = requests.Session()
+            get = lambda path: session.get(base_url + path, headers={'Accept-Encoding': 'br, gzip'})
+        for index in range(requests_per_client):
+            endpoint = BENCH['endpoints'][(offset + index) % len(BENCH['endpoints'])]
+            start = time.perf_counter()
+            try:
+                response = get(endpoint)
+            except Exception as e:
+                print(f"Error requesting {endpoint}: {str(e)}")
+                errors[endpoint] += 1
+                continue
+            latencies[endpoint].append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors[endpoint] += 1
+
+    helpers = [threading.Thread(target=sample_rss, daemon=True)]
+    if base_url is None and len(frames) > 1:
+        helpers.append(threading.Thread(target=churn, daemon=True))
+    for helper in helpers:
+        helper.start()
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    done.set()
+    for helper in helpers:
+        helper.join()
+
+    everything = [latency for values in latencies.values() for latency in values]
+    results = {
+        'throughput_rps': len(everything) / wall,
+        'p50_ms': percentile(everything, 0.5),
+        'p99_ms': percentile(everything, 0.99),
+        'peak_rss_mb': peak_rss[0] / (1024 * 1024),
+        'errors': sum(errors.values())
+    }
+    if base_url is not None:
+        # Our own memory says nothing about a server in another process
+        del results['peak_rss_mb']
+    for endpoint, values in latencies.items():
+        results[f"{endpoint} p50_ms"] = percentile(values, 0.5)
+        results[f"{endpoint} p99_ms"] = percentile(values, 0.99)
+    return results
+
+
+def flatten(results):
+    """Flatten {section: {feed: {metric: value}}} into {'section.feed.metric': value} for baselines."""
+    flat = {}
+    for section, feeds in results.items():
+        for label, metrics in feeds.items():
+            for metric, value in metrics.items():
+                if isinstance(value, dict):
+                    for stat, number in value.items():
+                        flat[f"{section}.{label}.{metric}.{stat}"] = number
+                else:
+                    flat[f"{section}.{label}.{metric}"] = value
+    return flat
+
+
+def get_tolerance(name, tolerance, load_tolerance, tail_tolerance):
+    """Get how much worse a flattened metric may get before it counts as a regression, or None if it isn't gated."""
+    section, _, metric = name.split('.', 2)
+    if section == 'micro':
+        return tolerance if metric.rsplit('.', 1)[-1] in GATED_MICRO else None
+    if metric not in GATED_LOAD:
+        return None
+    return tail_tolerance if metric == 'p99_ms' else load_tolerance
+
+
+def compare_to_baseline(flat, baseline, tolerance, load_tolerance, tail_tolerance):
+    """List the gated metrics that got worse than the baseline by more than their tolerance."""
+    regressions = []
+    for name, value in flat.items():
+        previous = baseline.get(name)
+        tolerance_for = get_tolerance(name, tolerance, load_tolerance, tail_tolerance)
+        if not previous or tolerance_for is None:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            worse = value < previous * (1 - tolerance_for)
+        else:
+            worse = value > previous * (1 + tolerance_for)
+        if worse:
+            regressions.append((name, previous, value))
+    return regressions
+
+
+def print_results(results):
+    for section, feeds in results.items():
+        for label, metrics in feeds.items():
+            print(f"\n{section} / {label}")
+            for metric, value in metrics.items():
+                if isinstance(value, dict):
+                    print(
+                        f"  {metric:<40} min {value['min_ms']:9.3f} ms   median {value['median_ms']:9.3f} ms   "
+                        f"p99 {value['p99_ms']:9.3f} ms"
+                    )
+                else:
+                    print(f"  {metric:<40} {value:12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark and load-test the leaderboard pipeline')
+    parser.add_argument('--recordings', help='Benchmark recorded feeds (a directory written by `standin.py record`) instead of synthetic ones')
+    parser.add_argument('--players', type=int, nargs='+', default=BENCH['players'], help='Synthetic field sizes')
+    parser.add_argument('--repeat', type=int, default=BENCH['repeat'])
+    parser.add_argument('--clients', type=int, default=BENCH['clients'])
+    parser.add_argument('--requests', type=int, default=BENCH['requests'], help='Requests per client')
+    parser.add_argument('--url', help='Load-test a running server (e.g. gunicorn) at this base URL instead of the in-process app')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-load', action='store_true')
+    parser.add_argument('--baseline', default=BENCH['baseline_path'])
+    parser.add_argument('--save-baseline', action='store_true', help='Record these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=BENCH['tolerance'])
+    parser.add_argument('--load-tolerance', type=float, default=BENCH['load_tolerance'])
+    parser.add_argument('--tail-tolerance', type=float, default=BENCH['tail_tolerance'])
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    feeds = recorded_feeds(args.recordings) if args.recordings else synthetic_feeds(args.players)
+    if not feeds:
+        print("No leaderboards to benchmark")
+        return 1
+
+    # Every microbenchmark runs before any load test, so none of them inherits a load test's heap
+    results = {'micro': {}, 'load': {}}
+    if not args.skip_micro:
+        for label, feed_entry in feeds.items():
+            results['micro'][label] = run_microbenchmarks(*feed_entry, args.repeat)
+    if not args.skip_load:
+        for label, feed_entry in feeds.items():
+            results['load'][label] = run_load_test(feed_entry, args.clients, args.requests, args.url)
+    print_results(results)
+
+    flat = flatten(results)
+    if args.json:
+        with open(args.json, 'w') as out_file:
+            json.dump(results, out_file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as out_file:
+            json.dump(flat, out_file, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    errors = sum(metrics.get('errors', 0) for metrics in results['load'].values())
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(flat, baseline, args.tolerance, args.load_tolerance, args.tail_tolerance)
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+    for name, previous, value in regressions:
+        print(f"REGRESSION {name}: {previous:.3f} -> {value:.3f} ({(value - previous) / previous:+.0%})")
+    if errors:
+        print(f"ERRORS: {errors} load-test requests did not return 200")
+    if regressions or errors:
+        return 1
+    if os.path.exists(args.baseline):
+        print(
+            f"\nNo regressions against {args.baseline} "
+            f"(tolerance {args.tolerance:.0%}, load {args.load_tolerance:.0%}, tail {args.tail_tolerance:.0%})"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
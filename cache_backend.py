@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; the SQLite backend falls back to an in-process lock
+    fcntl = None
+
+
+def _refill(tokens, updated, now, rate, capacity):
+    """Top a token bucket back up for the time elapsed since it was last touched."""
+    if tokens is None:
+        return capacity
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+def _token_wait(tokens, rate):
+    # A negative balance books a future slot, so concurrent callers queue up instead of bursting
+    return 0.0 if tokens >= 0 else -tokens / rate
+
+
+class MemoryBackend:
+    """Per-process cache and rate-limit state (the default, one copy per gunicorn worker)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_locks = {}
+        self._snapshot = None
+        self._generation = 0
+        self._tokens = None
+        self._tokens_updated = None
+
+    def get_generation(self):
+        return self._generation
+
+    def load_snapshot(self):
+        """Return the stored snapshot as {'data', 'last_updated', 'generation'} or None."""
+        return self._snapshot
+
+    def store_snapshot(self, data, last_updated):
+        """Store a freshly fetched snapshot and return its generation."""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = {
+                'data': data,
+                'last_updated': last_updated,
+                'generation': self._generation
+            }
+            return self._generation
+
+    @contextmanager
+    def refresh_lock(self, name='refresh'):
+        with self._lock:
+            lock = self._refresh_locks.setdefault(name, threading.Lock())
+        with lock:
+            yield
+
+    def reserve_token(self, rate, capacity):
+        """Take a token from the upstream rate-limit bucket and return how long to sleep before using it."""
+        with self._lock:
+            now = time.time()
+            self._tokens = _refill(self._tokens, self._tokens_updated, now, rate, capacity) - 1
+            self._tokens_updated = now
+            return _token_wait(self._tokens, rate)
+
+
+class SQLiteBackend:
+    """Cache and rate-limit state in a SQLite file shared by every worker on the host."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_locks = {}
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _get(self, conn, key, default=None):
+        row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set(self, conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    def get_generation(self):
+        return self._get(self._connect(), 'generation', 0)
+
+    def load_snapshot(self):
+        """Return the stored snapshot as {'data', 'last_updated', 'generation'} or None."""
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            data = self._get(conn, 'data')
+            if data is None:
+                return None
+            return {
+                'data': json.loads(data),
+                'last_updated': self._get(conn, 'last_updated'),
+                'generation': self._get(conn, 'generation', 0)
+            }
+        finally:
+            conn.execute("COMMIT")
+
+    def store_snapshot(self, data, last_updated):
+        """Store a freshly fetched snapshot and return its generation."""
+        payload = json.dumps(data)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            generation = self._get(conn, 'generation', 0) + 1
+            self._set(conn, 'data', payload)
+            self._set(conn, 'last_updated', last_updated)
+            self._set(conn, 'generation', generation)
+            conn.execute("COMMIT")
+            return generation
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @contextmanager
+    def refresh_lock(self, name='refresh'):
+        """Hold an exclusive lock across all processes while refreshing (one lock per name)."""
+        with self._lock:
+            thread_lock = self._thread_locks.setdefault(name, threading.Lock())
+        lock_path = self.lock_path if name == 'refresh' else f"{self.path}.{name}.lock"
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def reserve_token(self, rate, capacity):
+        """Take a token from the upstream rate-limit bucket and return how long to sleep before using it."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            tokens = _refill(self._get(conn, 'tokens'), self._get(conn, 'tokens_updated'), now, rate, capacity) - 1
+            self._set(conn, 'tokens', tokens)
+            self._set(conn, 'tokens_updated', now)
+            conn.execute("COMMIT")
+            return _token_wait(tokens, rate)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def create_backend(name=None, path=None):
+    """Create the cache backend selected by CACHE_BACKEND ('memory' or 'sqlite')."""
+    name = name or os.getenv('CACHE_BACKEND', 'memory')
+    if name == 'memory':
+        return MemoryBackend()
+    if name == 'sqlite':
+        path = path or os.getenv('CACHE_PATH', os.path.join(tempfile.gettempdir(), 'millerlite_cache.sqlite3'))
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown cache backend: {name}")
@@ -0,0 +1,116 @@
+import time
+import logging
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from field import diff_fields
+from payouts import UNPAID_STATUSES
+from standings import COMPLETED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# How often to pull a leaderboard, depending on what the feed says is happening
+CADENCE = {
+    'default_interval': 600,  # Until a fetch has planned its own (cold start, snapshots from older versions)
+    'live_interval': 240,  # Scores moving with players on the course, however few (the leaders go out last)
+    'max_interval': 960,  # Ceiling for the backoff while nothing changes between pulls
+    'backoff': 2,  # Each unchanged pull multiplies the interval by this much
+    'suspended_interval': 1800,  # Play suspended or delayed: check back for the restart
+    'day_start': 6,  # Local hours (at the course) when play can be underway
+    'day_end': 21,
+    'final_round': 4,
+    'default_timezone': 'America/New_York'  # Used until the summary supplies course_timezone
+}
+
+SUSPENDED_STATUSES = {'suspended', 'delayed'}
+
+
+def get_course_timezone(tournament):
+    """Get the course's time zone from the tournament details, falling back to CADENCE['default_timezone']."""
+    try:
+        return pytz.timezone(tournament.get('course_timezone') or CADENCE['default_timezone'])
+    except pytz.UnknownTimeZoneError:
+        logger.error(f"Unknown course time zone {tournament.get('course_timezone')}")
+        return pytz.timezone(CADENCE['default_timezone'])
+
+
+def is_play_hours(now, timezone):
+    return CADENCE['day_start'] <= datetime.fromtimestamp(now, timezone).hour < CADENCE['day_end']
+
+
+def seconds_until_play(now, timezone, day=None):
+    """Seconds until play can next be underway at the course (the next local day_start, or that of `day`)."""
+    local = datetime.fromtimestamp(now, timezone)
+    if day is None:
+        day = local.date() if local.hour < CADENCE['day_start'] else local.date() + timedelta(days=1)
+    # localize rather than replace so the day_start is right across DST changes
+    start = timezone.localize(datetime(day.year, day.month, day.day, CADENCE['day_start']))
+    return (start - local).total_seconds()
+
+
+def get_start_date(tournament):
+    try:
+        return date.fromisoformat(tournament.get('start_date') or '')
+    except ValueError:
+        return None
+
+
+def count_on_course(field):
+    """Count active players partway through their current round."""
+    return sum(
+        1 for player in field.players
+        if player.has_round and player.status not in UNPAID_STATUSES and 0 < (player.round_thru or 0) < 18
+    )
+
+
+def is_round_complete(field, round_number):
+    """Check whether every active player has finished the given round."""
+    active = [player for player in field.players if player.status not in UNPAID_STATUSES]
+    return bool(active) and all(
+        player.round_sequence == round_number and player.round_thru == 18 for player in active
+    )
+
+
+def plan_refresh(tournament, previous_field, field, previous_plan=None, now=None):
+    """Decide when to pull the leaderboard next, as {'phase', 'interval' (seconds, None to stop), 'quiet_polls', 'round_done'}."""
+    now = now or time.time()
+    previous_plan = previous_plan or {}
+    changed = previous_field is None or bool(diff_fields(previous_field, field))
+    quiet_polls = 0 if changed else previous_plan.get('quiet_polls', 0) + 1
+    on_course = count_on_course(field)
+    # Exponential backoff, reset the moment anything on the board moves
+    backoff = min(CADENCE['max_interval'], CADENCE['live_interval'] * CADENCE['backoff'] ** min(quiet_polls, 16))
+    timezone = get_course_timezone(tournament)
+    status = tournament.get('status')
+    round_number = tournament.get('round', 1)
+    local_date = datetime.fromtimestamp(now, timezone).date()
+    today = local_date.isoformat()
+    start_date = get_start_date(tournament)
+
+    # The feed keeps reporting the finished round until the next one tees off, so remember the local day it was
+    # first seen finished: that day we sleep until morning, the next day we wait for the first tee time
+    round_done = None
+    if round_number < CADENCE['final_round'] and is_round_complete(field, round_number):
+        round_done = previous_plan.get('round_done')
+        if not round_done or round_done[0] != round_number:
+            round_done = [round_number, today]
+
+    if status in COMPLETED_STATUSES:
+        phase, interval = 'closed', None
+    elif start_date and local_date < start_date and not on_course:
+        phase, interval = 'before_start', seconds_until_play(now, timezone, start_date)
+    elif on_course and status not in SUSPENDED_STATUSES:
+        # Only backs off on pulls that found nothing new, never on how few are out: the last groups are the leaders
+        phase, interval = 'live', backoff
+    elif round_done and round_done[1] == today:
+        # Nothing can change until the next round tees off
+        phase, interval = 'between_rounds', seconds_until_play(now, timezone)
+    elif not is_play_hours(now, timezone):
+        phase, interval = 'overnight', seconds_until_play(now, timezone)
+    elif status in SUSPENDED_STATUSES:
+        phase, interval = 'suspended', CADENCE['suspended_interval']
+    else:
+        # Before the first tee time, or the final round is done and we're waiting for the event to close
+        phase, interval = 'waiting', backoff
+    return {'phase': phase, 'interval': interval, 'quiet_polls': quiet_polls, 'round_done': round_done}
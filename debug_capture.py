@@ -0,0 +1,84 @@
+import os
+import gzip
+import json
+import queue
+import random
+import shutil
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Debug capture settings; everything here is off unless DEBUG_CAPTURE=1
+DEBUG_CAPTURE = {
+    'enabled': os.getenv('DEBUG_CAPTURE') == '1',
+    'sample_rate': float(os.getenv('DEBUG_CAPTURE_SAMPLE_RATE', '0.05')),  # Fraction of players logged per pass
+    'snapshot_path': os.getenv('DEBUG_CAPTURE_PATH'),  # When set, raw payloads are written here as JSON lines
+    'max_bytes': 10 * 1024 * 1024,
+    'backup_count': 5,
+    'listener': None
+}
+
+# Player-level debug lines; only enabled (and only formatted) in debug capture mode
+capture_logger = logging.getLogger('app.capture')
+capture_logger.setLevel(logging.DEBUG if DEBUG_CAPTURE['enabled'] else logging.WARNING)
+
+# Raw payload snapshots; kept out of flask.log and stdout
+snapshot_logger = logging.getLogger('app.capture.snapshots')
+snapshot_logger.propagate = False
+
+
+class LazyJSON:
+    """Defer json.dumps until a log record is actually formatted."""
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return json.dumps(self.obj, separators=(',', ':'), default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue records untouched so formatting happens on the listener thread, not the caller's."""
+
+    def prepare(self, record):
+        return record
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def start_debug_capture():
+    """Start the background writer for raw payload snapshots if debug capture is configured."""
+    if not DEBUG_CAPTURE['enabled'] or not DEBUG_CAPTURE['snapshot_path'] or DEBUG_CAPTURE['listener']:
+        return
+
+    file_handler = RotatingFileHandler(
+        DEBUG_CAPTURE['snapshot_path'],
+        maxBytes=DEBUG_CAPTURE['max_bytes'],
+        backupCount=DEBUG_CAPTURE['backup_count']
+    )
+    file_handler.namer = lambda name: f"{name}.gz"
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(logging.Formatter('{"captured_at":"%(asctime)s",%(message)s}'))
+
+    record_queue = queue.SimpleQueue()
+    snapshot_logger.addHandler(DeferredQueueHandler(record_queue))
+    snapshot_logger.setLevel(logging.INFO)
+    DEBUG_CAPTURE['listener'] = QueueListener(record_queue, file_handler)
+    DEBUG_CAPTURE['listener'].start()
+
+
+def capture_payload(kind, payload):
+    """Queue a raw upstream payload for the snapshot file (no-op unless capture is on)."""
+    if DEBUG_CAPTURE['listener'] is not None:
+        snapshot_logger.info('"kind":"%s","payload":%s', kind, LazyJSON(payload))
+
+
+def capture_player(name, raw, processed):
+    """Log a sampled player's raw and processed records at DEBUG."""
+    if capture_logger.isEnabledFor(logging.DEBUG) and random.random() < DEBUG_CAPTURE['sample_rate']:
+        capture_logger.debug("Processed player %s: raw=%s processed=%s", name, LazyJSON(raw), LazyJSON(processed))
@@ -0,0 +1,77 @@
+import json
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it the body is parsed whole and then projected
+    ijson = None
+
+# The only parts of a leaderboard payload the app reads; everything else (hole-by-hole scores, tee times,
+# bios, country codes...) is dropped as it's parsed
+PLAYER_FIELDS = ('first_name', 'last_name', 'position', 'tied', 'score', 'status', 'money')
+ROUND_FIELDS = ('sequence', 'thru', 'score', 'strokes')
+
+SCALAR_EVENTS = {'string', 'number', 'boolean', 'null'}
+
+# Full ijson prefixes mapped to the key they fill, so each kept value is one lookup and every dict shares
+# the same key strings (as json.loads does)
+PLAYER_PATHS = {f'leaderboard.item.{key}': key for key in PLAYER_FIELDS}
+ROUND_PATHS = {f'leaderboard.item.rounds.item.{key}': key for key in ROUND_FIELDS}
+
+# Bytes read from the socket per step; small enough that a step's batch of parse events stays small too
+READ_SIZE = 16 * 1024
+
+
+def compact_round(raw):
+    return {key: raw[key] for key in ROUND_FIELDS if key in raw}
+
+
+def compact_player(raw):
+    """Keep only the fields the field model reads; rounds shrink to their four summary numbers."""
+    player = {key: raw[key] for key in PLAYER_FIELDS if key in raw}
+    # Every round is kept (as four numbers) because the current one is found by matching sequence to count
+    player['rounds'] = [compact_round(round_data) for round_data in raw.get('rounds', [])]
+    return player
+
+
+def compact_leaderboard(payload):
+    """Project an already-parsed leaderboard payload down to what the app uses."""
+    if not payload:
+        return payload
+    compact = {key: value for key, value in payload.items() if not isinstance(value, (dict, list))}
+    compact['leaderboard'] = [compact_player(raw) for raw in payload.get('leaderboard', [])]
+    return compact
+
+
+def parse_leaderboard(stream):
+    """Parse a leaderboard body from a file-like stream, keeping only the fields the app uses.
+
+    With ijson the body is walked event by event, so the full tree is never built; without it the
+    body is loaded whole and projected.
+    """
+    if ijson is None:
+        return compact_leaderboard(json.load(stream))
+
+    compact = {'leaderboard': []}
+    player = None
+    round_data = None
+    for prefix, event, value in ijson.parse(stream, buf_size=READ_SIZE, use_float=True):
+        if prefix == 'leaderboard.item':
+            if event == 'start_map':
+                player = {'rounds': []}
+            elif event == 'end_map':
+                compact['leaderboard'].append(player)
+                player = None
+        elif prefix == 'leaderboard.item.rounds.item':
+            if event == 'start_map':
+                round_data = {}
+            elif event == 'end_map':
+                player['rounds'].append(round_data)
+                round_data = None
+        elif event in SCALAR_EVENTS:
+            if prefix in ROUND_PATHS:
+                round_data[ROUND_PATHS[prefix]] = value
+            elif prefix in PLAYER_PATHS:
+                player[PLAYER_PATHS[prefix]] = value
+            elif '.' not in prefix and prefix != 'leaderboard':
+                compact[prefix] = value
+    return compact
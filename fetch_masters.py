@@ -1,32 +1,23 @@
-import os
-import requests
-import json
-from dotenv import load_dotenv
-from datetime import datetime
+import time
+import argparse
 
-# Load environment variables
-load_dotenv()
+import feed
+import upstream
+from upstream import SPORTSRADAR_API_KEY
 
-# SportsRadar API configuration
-SPORTSRADAR_API_KEY = os.getenv('SPORTSRADAR_API_KEY')
-SPORTSRADAR_BASE_URL = "https://api.sportradar.com/golf/trial/pga/v3/en"
+# The schedule only changes when an event finishes, so a cached copy this recent is used without asking upstream
+SCHEDULE_MAX_AGE = 21600
+
+# Schedule statuses for events that have a leaderboard to pull
+PLAYED_STATUSES = {'inprogress', 'suspended', 'delayed', 'closed', 'complete'}
 
 def fetch_tournament_schedule(year):
     """Fetch the tournament schedule for a given year."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/{year}/tournaments/schedule.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
-        
         print(f"Fetching {year} tournament schedule...")
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
-            
-        schedule_data = response.json()
+        schedule_data = upstream.fetch_json(upstream.build_url(upstream.schedule_path(year)), max_age=SCHEDULE_MAX_AGE)
+        if schedule_data is None:
+            print("Error: could not fetch schedule")
         return schedule_data
     except Exception as e:
         print(f"Error fetching schedule: {str(e)}")
@@ -35,19 +26,10 @@ def fetch_tournament_schedule(year):
 def fetch_tournament_summary(year, tournament_id):
     """Fetch detailed tournament summary."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/{year}/tournaments/{tournament_id}/summary.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
-        
         print(f"Fetching tournament summary...")
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
-            
-        summary_data = response.json()
+        summary_data = upstream.fetch_json(upstream.build_url(upstream.summary_path(year, tournament_id)))
+        if summary_data is None:
+            print("Error: could not fetch tournament summary")
         return summary_data
     except Exception as e:
         print(f"Error fetching tournament summary: {str(e)}")
@@ -56,24 +38,56 @@ def fetch_tournament_summary(year, tournament_id):
 def fetch_tournament_leaderboard(year, tournament_id):
     """Fetch tournament leaderboard data."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/{year}/tournaments/{tournament_id}/leaderboard.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
-        
         print(f"Fetching tournament leaderboard...")
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
-            
-        leaderboard_data = response.json()
+        leaderboard_data = upstream.fetch_json(upstream.build_url(upstream.leaderboard_path(year, tournament_id)))
+        if leaderboard_data is None:
+            print("Error: could not fetch leaderboard")
         return leaderboard_data
     except Exception as e:
         print(f"Error fetching leaderboard: {str(e)}")
         return None
 
+def fetch_season_leaderboards(year):
+    """Pull the leaderboard of every event played so far in a season, as (events, {tournament_id: leaderboard or None})."""
+    schedule = fetch_tournament_schedule(year)
+    if not schedule:
+        return [], {}
+    events = [event for event in schedule.get('tournaments', []) if event.get('status') in PLAYED_STATUSES]
+    print(f"Fetching {len(events)} leaderboards...")
+    # All requested at once: they queue on the shared rate limit, and finished events already cached cost no request
+    results = upstream.fetch_batch(
+        {event['id']: upstream.build_url(upstream.leaderboard_path(year, event['id'])) for event in events},
+        {event['id']: feed.parse_leaderboard for event in events}
+    )
+    return events, results
+
+def get_leader(leaderboard_data):
+    """Get the player at the top of a leaderboard, or None."""
+    players = (leaderboard_data or {}).get('leaderboard', [])
+    ranked = [player for player in players if isinstance(player.get('position'), int)]
+    return min(ranked, key=lambda player: player['position']) if ranked else None
+
+def display_season(events, results):
+    """Display each event's status and leader, in schedule order."""
+    print("\nSeason Leaders:")
+    print("------------------------")
+    for event in sorted(events, key=lambda event: event.get('start_date', '')):
+        leader = get_leader(results.get(event['id']))
+        if leader is None:
+            standing = 'No leaderboard available'
+        else:
+            score = leader.get('score', 'E')
+            score = 'E' if score == 0 else f"{'+' if score > 0 else ''}{score}" if score is not None else 'N/A'
+            standing = f"{leader.get('first_name', '')} {leader.get('last_name', '')} ({score})"
+        print(f"{event.get('start_date', ''):<12} {event.get('name', 'Tournament'):<45} {event.get('status', ''):<11} {standing}")
+
+def display_cache_stats(elapsed):
+    """Summarize how many upstream lookups the response cache answered."""
+    fresh = upstream.UPSTREAM_CACHE.value(result='fresh')
+    not_modified = upstream.UPSTREAM_CACHE.value(result='not_modified')
+    stored = upstream.UPSTREAM_CACHE.value(result='stored')
+    print(f"\n{fresh} served from cache, {not_modified} not modified, {stored} downloaded in {elapsed:.1f}s")
+
 def display_leaderboard(leaderboard_data, tournament_info=None):
     """Display the leaderboard in a formatted way."""
     if tournament_info:
@@ -113,12 +127,21 @@ def display_leaderboard(leaderboard_data, tournament_info=None):
         print(f"{position}{tied}. {name:<30} {score:<5} (Today: {today}, Thru: {thru})")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Print the Masters leaderboard, or every event of a season')
+    parser.add_argument('--year', type=int, default=2025)  # 2025 since that's the tournament we want
+    parser.add_argument('--season', action='store_true', help="Pull every played event's leaderboard for the year")
+    args = parser.parse_args()
+    start_time = time.time()
+    
     if not SPORTSRADAR_API_KEY:
         print("Error: SPORTSRADAR_API_KEY not found in environment variables")
         print("Please create a .env file with your API key")
+    elif args.season:
+        events, results = fetch_season_leaderboards(args.year)
+        display_season(events, results)
+        display_cache_stats(time.time() - start_time)
     else:
-        # Get current year
-        current_year = 2025  # Hardcoding to 2025 since that's the tournament we want
+        current_year = args.year
         
         # Fetch tournament schedule
         schedule = fetch_tournament_schedule(current_year)
@@ -132,12 +155,17 @@ if __name__ == "__main__":
             if masters_tournament:
                 tournament_id = masters_tournament['id']
                 
-                # Fetch tournament summary for additional details
-                summary = fetch_tournament_summary(current_year, tournament_id)
+                # Summary and leaderboard only depend on the tournament ID, so fetch them concurrently
+                print("Fetching tournament summary and leaderboard...")
+                results = upstream.fetch_batch({
+                    'summary': upstream.build_url(upstream.summary_path(current_year, tournament_id)),
+                    'leaderboard': upstream.build_url(upstream.leaderboard_path(current_year, tournament_id))
+                })
                 
-                # Fetch and display leaderboard
-                leaderboard = fetch_tournament_leaderboard(current_year, tournament_id)
+                # Display leaderboard, preferring the summary's venue and course details
+                leaderboard = results['leaderboard']
                 if leaderboard:
-                    display_leaderboard(leaderboard, masters_tournament)
+                    display_leaderboard(leaderboard, results['summary'] or masters_tournament)
             else:
-                print(f"Could not find Masters tournament in {current_year} schedule") 
\ No newline at end of file
+                print(f"Could not find Masters tournament in {current_year} schedule")
+        display_cache_stats(time.time() - start_time)
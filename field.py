@@ -0,0 +1,184 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+from payouts import position_number
+
+# Name suffixes ignored when matching picks to the feed ("Davis Love III" == "Davis Love")
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+
+def normalize_name(name):
+    """Normalize a player name for matching: accent, case, punctuation and suffix insensitive."""
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    ascii_name = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    # Scandinavian letters don't decompose, so fold them by hand
+    ascii_name = ascii_name.translate(str.maketrans({'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'AE', 'ß': 'ss', 'đ': 'd', 'Đ': 'D'}))
+    words = re.sub(r"[^a-z0-9 ]+", ' ', ascii_name.lower().replace("'", '').replace('\u2019', '')).split()
+    while len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words.pop()
+    # Join initials so "J.J. Spaun", "J. J. Spaun" and "JJ Spaun" all match
+    merged = []
+    joining = False
+    for word in words:
+        if len(word) == 1 and joining:
+            merged[-1] += word
+        else:
+            merged.append(word)
+            joining = len(word) == 1
+    return ' '.join(merged)
+
+
+class Player:
+    """One player's leaderboard entry, reduced to the fields the app uses."""
+
+    __slots__ = (
+        'name', 'key', 'position', 'tied', 'score', 'status',
+        'has_round', 'round_sequence', 'round_thru', 'round_score', 'round_strokes', 'money', 'raw'
+    )
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.name = f"{raw.get('first_name', '')} {raw.get('last_name', '')}"
+        self.key = normalize_name(self.name)
+        self.position = raw.get('position', '-')
+        self.tied = raw.get('tied', False)
+        self.score = raw.get('score', 'E')
+        self.status = raw.get('status', '')
+        self.money = raw.get('money')
+
+        current_round = find_current_round(raw.get('rounds', []))
+        self.has_round = current_round is not None
+        current_round = current_round or {}
+        self.round_sequence = current_round.get('sequence')
+        self.round_thru = current_round.get('thru', 0)
+        self.round_score = current_round.get('score', 0)
+        self.round_strokes = current_round.get('strokes', 0)
+
+
+def find_current_round(rounds):
+    """Find the current round (the one whose sequence equals the number of rounds)."""
+    if not rounds:
+        return None
+    # Rounds come back in order, so the last one is almost always it
+    if rounds[-1].get('sequence') == len(rounds):
+        return rounds[-1]
+    for round_data in reversed(rounds):
+        if round_data.get('sequence') == len(rounds):
+            return round_data
+    return None
+
+
+class Field:
+    """The whole field for one fetch, indexed by normalized name."""
+
+    __slots__ = ('players', 'by_key', 'name_index')
+
+    def __init__(self, leaderboard_data):
+        self.players = [Player(raw) for raw in (leaderboard_data or {}).get('leaderboard', [])]
+        self.by_key = {}
+        for player in self.players:
+            self.by_key.setdefault(player.key, player)
+        # Built on the first search, as most fields are never searched
+        self.name_index = None
+
+    def lookup(self, name):
+        """Find a player by name, ignoring accents, case, punctuation and suffixes."""
+        return self.by_key.get(normalize_name(name))
+
+    def get_name_index(self):
+        """Sorted (name from each word on, leaderboard index) pairs, so any word of a name can be prefix-searched."""
+        if self.name_index is None:
+            index = []
+            for number, player in enumerate(self.players):
+                words = player.key.split()
+                index.extend((' '.join(words[start:]), number) for start in range(len(words)))
+            index.sort()
+            self.name_index = index
+        return self.name_index
+
+    def search(self, prefix):
+        """Find players with a first, middle or last name starting with `prefix`, in leaderboard order."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return list(self.players)
+        index = self.get_name_index()
+        found = set()
+        start = bisect_left(index, (prefix,))
+        # Matches sit together right after where the prefix would sort
+        while start < len(index) and index[start][0].startswith(prefix):
+            found.add(index[start][1])
+            start += 1
+        return [self.players[number] for number in sorted(found)]
+
+    def __len__(self):
+        return len(self.players)
+
+
+def player_signature(player):
+    """Everything about a player that can change their formatted row."""
+    return (
+        player.position, player.tied, player.score, player.status,
+        player.round_sequence, player.round_thru, player.round_score, player.round_strokes
+    )
+
+
+def diff_fields(previous, current):
+    """Compare two fields player by player and list who changed (and how far they moved)."""
+    previous_by_key = previous.by_key if previous is not None else {}
+    changes = []
+    for key, player in current.by_key.items():
+        old = previous_by_key.get(key)
+        if old is not None and player_signature(old) == player_signature(player):
+            continue
+
+        change = {
+            'player': player.name,
+            'position': player.position,
+            'tied': player.tied,
+            'score': player.score,
+            'thru': player.round_thru,
+            'status': player.status
+        }
+        if old is None:
+            change['added'] = True
+        else:
+            change['previous_position'] = old.position
+            change['previous_score'] = old.score
+            old_number, new_number = position_number(old.position), position_number(player.position)
+            # Positive means the player moved up the board
+            change['moved'] = old_number - new_number if old_number is not None and new_number is not None else None
+        changes.append(change)
+
+    for key, old in previous_by_key.items():
+        if key not in current.by_key:
+            changes.append({'player': old.name, 'removed': True})
+    return changes
+
+
+def merge_changes(change_lists):
+    """Fold successive change lists (oldest first) into one entry per player spanning the whole range."""
+    merged = {}
+    for changes in change_lists:
+        for change in changes:
+            key = normalize_name(change['player'])
+            earlier = merged.get(key)
+            if earlier is None:
+                merged[key] = dict(change)
+                continue
+            combined = dict(change)
+            # Keep where the player started the range, not where they were one refresh ago
+            for field_name in ('previous_position', 'previous_score', 'added'):
+                if field_name in earlier:
+                    combined[field_name] = earlier[field_name]
+                else:
+                    combined.pop(field_name, None)
+            old_number = position_number(combined.get('previous_position'))
+            new_number = position_number(combined.get('position'))
+            if 'previous_position' in combined:
+                combined['moved'] = old_number - new_number if old_number is not None and new_number is not None else None
+            else:
+                # Joined partway through the range, so there's no starting place to have moved from
+                combined.pop('moved', None)
+            merged[key] = combined
+    return list(merged.values())
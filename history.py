@@ -0,0 +1,124 @@
+import os
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Where every fetched snapshot is kept; set HISTORY_PATH to '' to disable
+HISTORY_PATH = os.getenv('HISTORY_PATH', 'leaderboard_history.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    tournament_id TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    leaderboard BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_time ON snapshots (tournament_id, fetched_at);
+
+-- One row per player per snapshot in which something about them changed; a series is a step function
+CREATE TABLE IF NOT EXISTS player_points (
+    tournament_id TEXT NOT NULL,
+    player_key TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    name TEXT,
+    position TEXT,
+    tied INTEGER,
+    score,
+    thru,
+    round INTEGER,
+    round_score,
+    status TEXT,
+    PRIMARY KEY (tournament_id, player_key, fetched_at)
+) WITHOUT ROWID;
+"""
+
+POINT_COLUMNS = ('fetched_at', 'snapshot_id', 'name', 'position', 'tied', 'score', 'thru', 'round', 'round_score', 'status')
+
+
+class HistoryStore:
+    """Append-only log of fetched leaderboards and per-player movement, in a local SQLite file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def record_snapshot(self, tournament_id, generation, fetched_at, leaderboard_data, players):
+        """Append a fetched leaderboard plus a point for each of `players` (the ones that changed)."""
+        blob = gzip.compress(json.dumps(leaderboard_data, separators=(',', ':')).encode('utf-8'), compresslevel=6)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (tournament_id, generation, fetched_at, leaderboard) VALUES (?, ?, ?, ?)",
+                (tournament_id, generation, fetched_at, blob)
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR REPLACE INTO player_points "
+                "(tournament_id, player_key, fetched_at, snapshot_id, name, position, tied, score, thru, round, round_score, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        tournament_id, player.key, fetched_at, snapshot_id, player.name, str(player.position),
+                        int(bool(player.tied)), player.score, player.round_thru, player.round_sequence,
+                        player.round_score, player.status
+                    )
+                    for player in players
+                ]
+            )
+            conn.execute("COMMIT")
+            return snapshot_id
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            logger.error(f"Error recording leaderboard history: {str(e)}")
+            return None
+
+    def player_series(self, tournament_id, player_key, start=None, end=None):
+        """Get one player's points in [start, end], led by the last point before start so the series starts correct."""
+        conn = self._connect()
+        start = start if start is not None else float('-inf')
+        end = end if end is not None else float('inf')
+        columns = ', '.join(POINT_COLUMNS)
+        # Both queries are range scans on the primary key, so they never touch other players or raw snapshots
+        rows = conn.execute(
+            f"SELECT {columns} FROM player_points WHERE tournament_id = ? AND player_key = ? AND fetched_at < ? "
+            "ORDER BY fetched_at DESC LIMIT 1",
+            (tournament_id, player_key, start)
+        ).fetchall()
+        rows += conn.execute(
+            f"SELECT {columns} FROM player_points WHERE tournament_id = ? AND player_key = ? AND fetched_at BETWEEN ? AND ? "
+            "ORDER BY fetched_at",
+            (tournament_id, player_key, start, end)
+        ).fetchall()
+        return [dict(zip(POINT_COLUMNS, row)) for row in rows]
+
+    def load_leaderboard(self, snapshot_id):
+        """Get the raw leaderboard payload stored with a snapshot, or None."""
+        row = self._connect().execute("SELECT leaderboard FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        return json.loads(gzip.decompress(row[0])) if row else None
+
+
+def open_history(path=HISTORY_PATH):
+    """Open the history store, or None if it's disabled or can't be opened."""
+    if not path:
+        return None
+    try:
+        return HistoryStore(path)
+    except Exception as e:
+        logger.error(f"Error opening leaderboard history at {path}: {str(e)}")
+        return None
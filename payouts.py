@@ -0,0 +1,57 @@
+from collections import Counter
+
+# Statuses that never get paid, whatever their position says
+UNPAID_STATUSES = {'CUT', 'WD', 'DQ'}
+
+
+class PayoutTable:
+    """Payout per finishing position for one tournament, with prefix sums for O(1) tie splits."""
+
+    __slots__ = ('amounts', 'prefix')
+
+    def __init__(self, amounts):
+        self.amounts = list(amounts)
+        self.prefix = [0]
+        for amount in self.amounts:
+            self.prefix.append(self.prefix[-1] + amount)
+
+    @classmethod
+    def from_structure(cls, structure, scale=1.0, extend_to=None):
+        """Build a table from {position: amount}, scaled to a purse and optionally extended past the last paid slot."""
+        amounts = [structure[position] * scale for position in sorted(structure)]
+        if extend_to and len(amounts) >= 2:
+            # Past the published slots each position pays one more step less, as the tour does for big made-cut fields
+            step = amounts[-2] - amounts[-1]
+            while len(amounts) < extend_to and amounts[-1] - step > 0:
+                amounts.append(amounts[-1] - step)
+        return cls(amounts)
+
+    def split(self, position, count=1):
+        """Average the purse slots occupied by `count` players tied at `position` (1-based)."""
+        size = len(self.amounts)
+        start = min(position - 1, size)
+        end = min(position - 1 + count, size)
+        return (self.prefix[end] - self.prefix[start]) / count
+
+
+def position_number(position):
+    """Parse a position like 3, '3' or 'T3' into an int, or None."""
+    if isinstance(position, str) and position.startswith('T'):
+        position = position[1:]
+    try:
+        return int(position)
+    except (TypeError, ValueError):
+        return None
+
+
+def project_payouts(players, table):
+    """Project every player's payout in one pass, splitting purses across ties; returns {player.key: amount}."""
+    paid = []
+    for player in players:
+        number = position_number(player.position)
+        if number is not None and player.status not in UNPAID_STATUSES:
+            paid.append((player.key, number))
+
+    tie_counts = Counter(number for _, number in paid)
+    split_by_position = {number: round(table.split(number, count)) for number, count in tie_counts.items()}
+    return {key: split_by_position[number] for key, number in paid}
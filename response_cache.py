@@ -0,0 +1,145 @@
+import os
+import gzip
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+import tempfile
+import threading
+
+from standings import COMPLETED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Where upstream responses are kept between runs; set RESPONSE_CACHE_PATH to '' to disable
+RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', 'response_cache')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    immutable INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+ENTRY_COLUMNS = ('key', 'digest', 'etag', 'last_modified', 'fetched_at', 'immutable')
+
+
+def is_immutable(payload):
+    """Check whether a payload belongs to a finished event, whose data never changes again."""
+    return isinstance(payload, dict) and payload.get('status') in COMPLETED_STATUSES
+
+
+class BodyRecorder:
+    """File-like wrapper that hashes and gzips a body as it's read, so it can be cached without a second copy."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self._hash = hashlib.sha256()
+        # wbits=31 writes a gzip container (with mtime 0), readable by gzip.open
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        self._chunks = []
+
+    def feed(self, data):
+        if data:
+            self._hash.update(data)
+            self._chunks.append(self._compressor.compress(data))
+        return data
+
+    def read(self, size=-1):
+        return self.feed(self.stream.read(size))
+
+    def finish(self):
+        """Return (digest, gzipped body) for everything read so far."""
+        self._chunks.append(self._compressor.flush())
+        return self._hash.hexdigest(), b''.join(self._chunks)
+
+
+class ResponseCache:
+    """Upstream response bodies on disk, gzipped and stored by content hash, indexed by request with their validators."""
+
+    def __init__(self, path):
+        self.path = path
+        self.objects = os.path.join(path, 'objects')
+        os.makedirs(self.objects, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.path, 'index.sqlite3'), timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects, digest[:2], f"{digest[2:]}.json.gz")
+
+    def lookup(self, key):
+        """Get the cached entry for a request key, or None (also when its body has gone missing)."""
+        columns = ', '.join(ENTRY_COLUMNS)
+        row = self._connect().execute(f"SELECT {columns} FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(ENTRY_COLUMNS, row))
+        return entry if os.path.exists(self._object_path(entry['digest'])) else None
+
+    def open_body(self, entry):
+        """Open a cached body as a decompressing binary stream."""
+        return gzip.open(self._object_path(entry['digest']), 'rb')
+
+    def store(self, key, digest, compressed, etag=None, last_modified=None, immutable=False):
+        """Record a fetched body under its content hash (written once, however many requests share it)."""
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            # Write then rename, so another worker never reads half a body
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(object_path))
+            with os.fdopen(fd, 'wb') as object_file:
+                object_file.write(compressed)
+            os.replace(temp_path, object_path)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            previous = conn.execute("SELECT digest FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, digest, etag, last_modified, fetched_at, immutable) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, digest, etag, last_modified, time.time(), int(immutable))
+            )
+            # A live leaderboard is replaced every poll; drop the old body once nothing points at it
+            stale = None
+            if previous and previous[0] != digest:
+                in_use = conn.execute("SELECT 1 FROM responses WHERE digest = ? LIMIT 1", (previous[0],)).fetchone()
+                stale = None if in_use else previous[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if stale:
+            try:
+                os.remove(self._object_path(stale))
+            except OSError:
+                pass
+
+    def touch(self, key):
+        """Mark a cached entry as just revalidated."""
+        self._connect().execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+
+
+def open_response_cache(path=RESPONSE_CACHE_PATH):
+    """Open the response cache, or None if it's disabled or can't be opened."""
+    if not path:
+        return None
+    try:
+        return ResponseCache(path)
+    except Exception as e:
+        logger.error(f"Error opening response cache at {path}: {str(e)}")
+        return None
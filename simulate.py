@@ -0,0 +1,114 @@
+import numpy as np
+
+from payouts import UNPAID_STATUSES
+
+# Simulation settings
+SIMULATION = {
+    'trials': 20000,
+    'rounds': 4,
+    # Tour-average chance of each score relative to par on a single hole (eagle, birdie, par, bogey, double+)
+    'hole_outcomes': (-2, -1, 0, 1, 2),
+    'hole_probabilities': (0.005, 0.20, 0.62, 0.15, 0.025)
+}
+
+
+def get_hole_distribution():
+    """Mean and standard deviation of one hole's score relative to par."""
+    outcomes = np.array(SIMULATION['hole_outcomes'], dtype=float)
+    probabilities = np.array(SIMULATION['hole_probabilities'], dtype=float)
+    mean = float(outcomes @ probabilities)
+    variance = float((outcomes ** 2) @ probabilities) - mean ** 2
+    return mean, variance ** 0.5
+
+
+def get_holes_remaining(player, rounds=None):
+    """Holes a player still has to play, from their current round and thru."""
+    rounds = rounds or SIMULATION['rounds']
+    if not player.has_round:
+        return rounds * 18
+    thru = player.round_thru if isinstance(player.round_thru, int) else 0
+    return max(0, (rounds - player.round_sequence) * 18 + (18 - thru))
+
+
+def rank_with_ties(scores):
+    """For each cell, count players strictly ahead and players level (including itself), row by row."""
+    trials, players = scores.shape
+    low = scores.min()
+    band = int(scores.max() - low) + 1
+    # Shift each row into its own band of score slots so one flat histogram covers every trial at once
+    keys = (scores - low).astype(np.int64) + (np.arange(trials, dtype=np.int64) * band)[:, None]
+    counts = np.bincount(keys.ravel(), minlength=trials * band)
+    below = np.cumsum(counts) - counts
+    ahead = below[keys] - (np.arange(trials, dtype=np.int64) * players)[:, None]
+    return ahead, counts[keys]
+
+
+def simulate_field(players, table, trials=None, seed=None):
+    """Simulate the rest of the event for the whole field at once.
+
+    Returns (final scores, payouts, players ahead, players level), each shaped (trials, players).
+    Cut, withdrawn and disqualified players are ranked behind everyone and paid nothing.
+    """
+    trials = trials or SIMULATION['trials']
+    rng = np.random.default_rng(seed)
+    hole_mean, hole_std = get_hole_distribution()
+
+    current = np.array([player.score if isinstance(player.score, int) else 0 for player in players], dtype=float)
+    remaining = np.array([get_holes_remaining(player) for player in players], dtype=float)
+    active = np.array([player.status not in UNPAID_STATUSES for player in players])
+
+    # A sum of many independent holes is close to normal, which avoids drawing every hole separately
+    noise = rng.standard_normal((trials, len(players)), dtype=np.float32)
+    simulated = np.rint(current + remaining * hole_mean + noise * (np.sqrt(remaining) * hole_std)).astype(np.int32)
+    # Inactive players sit one stroke behind the worst active score, keeping every trial's score range tight
+    simulated[:, ~active] = (simulated[:, active].max() if active.any() else 0) + 1
+
+    ahead, level = rank_with_ties(simulated)
+
+    # The table's prefix sums, held flat past the last paid slot, make every tie split a lookup and a divide
+    prefix = np.asarray(table.prefix, dtype=float)[:len(players) + 1]
+    prefix = np.concatenate([prefix, np.full(len(players) + 1 - len(prefix), prefix[-1])])
+    payouts = (prefix[ahead + level] - prefix[ahead]) / level
+    payouts[:, ~active] = 0.0
+    return simulated, payouts, ahead, level
+
+
+def simulate_league(field, picks, table, trials=None, seed=None):
+    """Expected payout and pool-win probability for each member's pick."""
+    players = field.players
+    members = list(picks)
+    results = {}
+    if not players:
+        return results
+
+    scores, payouts, ahead, level = simulate_field(players, table, trials, seed)
+    trials = scores.shape[0]
+
+    # Members whose pick isn't in the field score as badly as a cut player
+    missing_score = scores.max() + 1
+    index_by_player = {id(player): index for index, player in enumerate(players)}
+    pick_index = [index_by_player.get(id(field.lookup(picks[member]))) for member in members]
+    member_scores = np.stack([
+        scores[:, index] if index is not None else np.full(trials, missing_score, dtype=scores.dtype)
+        for index in pick_index
+    ], axis=1)
+
+    # The pool goes to whoever holds the best-finishing golfer; shared golfers and ties split it
+    best = member_scores.min(axis=1, keepdims=True)
+    winners = member_scores == best
+    pool_share = winners / winners.sum(axis=1, keepdims=True)
+    pool_win = pool_share.mean(axis=0)
+
+    # Winning the tournament outright counts fully; a tie for first counts as a share of the playoff
+    tournament_win = np.where(ahead == 0, 1.0 / level, 0.0)
+
+    for column, member in enumerate(members):
+        index = pick_index[column]
+        results[member] = {
+            "player": picks[member],
+            "pool_win_probability": round(float(pool_win[column]), 4),
+            "expected_payout": round(float(payouts[:, index].mean())) if index is not None else 0,
+            "win_probability": round(float(tournament_win[:, index].mean()), 4) if index is not None else 0.0,
+            "top_10_probability": round(float((ahead[:, index] < 10).mean()), 4) if index is not None else 0.0
+        }
+    return results
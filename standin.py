@@ -0,0 +1,319 @@
+import os
+import json
+import time
+import random
+import argparse
+import threading
+
+from flask import Flask, Response, request
+
+# Tour-average chance of each score relative to par on a single hole (eagle, birdie, par, bogey, double)
+HOLE_OUTCOMES = (-2, -1, 0, 1, 2)
+HOLE_WEIGHTS = (0.005, 0.20, 0.62, 0.15, 0.025)
+
+# Real names for the top of the synthetic field, so league picks resolve against it
+FEATURED_NAMES = (
+    ('Scottie', 'Scheffler'), ('Xander', 'Schauffele'), ('Collin', 'Morikawa'), ('Patrick', 'Cantlay'),
+    ('Russell', 'Henley'), ('Jordan', 'Spieth'), ('Viktor', 'Hovland'), ('Sahith', 'Theegala'),
+    ('Corey', 'Conners'), ('Ryan', 'Gerard'), ('Ludvig', 'Åberg'), ('Tommy', 'Fleetwood')
+)
+
+# Simulated tournament clock, in seconds of tournament time
+SYNTHETIC = {
+    'round_interval': 86400,  # One round a day
+    'tee_window': 5 * 3600,  # First to last tee time each round
+    'hole_duration': 900,  # Fifteen minutes a hole
+    'par': 72,
+    'cut_size': 65,  # Top 65 and ties play the weekend
+    'rounds': 4
+}
+
+
+class SyntheticTournament:
+    """A four-round event generated from a seed, advancing with the tournament clock."""
+
+    def __init__(self, year=2025, tournament_id='standin-0000-0000-0000-000000000000', players=156, seed=1):
+        rng = random.Random(seed)
+        self.year = year
+        self.tournament_id = tournament_id
+        self.players = []
+        for index in range(players):
+            # A per-player skill shift (positive is better, about a stroke a round per 0.006) keeps it from being pure noise
+            skill = rng.gauss(0, 0.006)
+            weights = [max(0.0, w - skill * o) for o, w in zip(HOLE_OUTCOMES, HOLE_WEIGHTS)]
+            first_name, last_name = FEATURED_NAMES[index] if index < len(FEATURED_NAMES) else (f"Player{index + 1}", f"Standin{index + 1}")
+            self.players.append({
+                'first_name': first_name,
+                'last_name': last_name,
+                'holes': [rng.choices(HOLE_OUTCOMES, weights, k=18) for _ in range(SYNTHETIC['rounds'])]
+            })
+
+    def tee_time(self, index, round_index):
+        """When a player tees off in a round, in tournament seconds."""
+        slot = index % 78
+        return round_index * SYNTHETIC['round_interval'] + slot * SYNTHETIC['tee_window'] / 78
+
+    def holes_played(self, index, round_index, clock):
+        return max(0, min(18, int((clock - self.tee_time(index, round_index)) // SYNTHETIC['hole_duration'])))
+
+    def end_time(self):
+        last_round = SYNTHETIC['rounds'] - 1
+        return self.tee_time(77, last_round) + 18 * SYNTHETIC['hole_duration']
+
+    def status(self, clock):
+        if clock < 0:
+            return 'scheduled'
+        return 'closed' if clock >= self.end_time() else 'inprogress'
+
+    def schedule(self, clock):
+        return {'tournaments': [self.details(clock)]}
+
+    def details(self, clock):
+        return {
+            'id': self.tournament_id,
+            'name': 'Stand-in Invitational',
+            'start_date': f"{self.year}-04-17",
+            'end_date': f"{self.year}-04-20",
+            'status': self.status(clock),
+            'purse': 20000000,
+            'event_type': 'stroke'
+        }
+
+    def summary(self, clock):
+        summary = self.details(clock)
+        summary.update({
+            'course_timezone': 'America/New_York',
+            'venue': {'name': 'Stand-in Golf Links', 'city': 'Hilton Head Island', 'state': 'SC', 'country': 'USA'}
+        })
+        return summary
+
+    def leaderboard(self, clock):
+        """The leaderboard as SportsRadar would return it at tournament time `clock`."""
+        current_round = max(1, min(SYNTHETIC['rounds'], int(clock // SYNTHETIC['round_interval']) + 1)) if clock >= 0 else 0
+        cut_made = None
+        if current_round > 2:
+            # The cut is made on 36-hole totals once round 3 starts
+            totals = sorted(sum(map(sum, player['holes'][:2])) for player in self.players)
+            cut_line = totals[min(SYNTHETIC['cut_size'], len(totals)) - 1]
+            cut_made = [sum(map(sum, player['holes'][:2])) <= cut_line for player in self.players]
+
+        rows = []
+        for index, player in enumerate(self.players):
+            missed_cut = cut_made is not None and not cut_made[index]
+            rounds = []
+            for round_index in range(min(current_round, 2) if missed_cut else current_round):
+                thru = self.holes_played(index, round_index, clock)
+                score = sum(player['holes'][round_index][:thru])
+                rounds.append({
+                    'sequence': round_index + 1,
+                    'thru': thru,
+                    'score': score,
+                    'strokes': thru * SYNTHETIC['par'] // 18 + score
+                })
+            rows.append({
+                'first_name': player['first_name'],
+                'last_name': player['last_name'],
+                'score': sum(round_data['score'] for round_data in rounds),
+                'status': 'CUT' if missed_cut else None,
+                'rounds': rounds
+            })
+
+        # Players who made the cut rank ahead of those who didn't; equal scores share a position
+        rows.sort(key=lambda row: (row['status'] == 'CUT', row['score']))
+        for index, row in enumerate(rows):
+            previous = rows[index - 1] if index else None
+            same = previous is not None and (previous['status'], previous['score']) == (row['status'], row['score'])
+            row['position'] = previous['position'] if same else index + 1
+        counts = {}
+        for row in rows:
+            counts[row['position']] = counts.get(row['position'], 0) + 1
+        for row in rows:
+            row['tied'] = counts[row['position']] > 1
+
+        return {
+            'id': self.tournament_id,
+            'name': 'Stand-in Invitational',
+            'status': self.status(clock),
+            'round': current_round,
+            'leaderboard': rows
+        }
+
+
+class Recordings:
+    """Recorded responses on disk: plain files for fixed paths, a directory of timestamped files for timelines."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.timelines = {}
+
+    def get_timeline(self, path):
+        """Recorded (timestamp, file) pairs for a path like '2025/tournaments/<id>/leaderboard.json', oldest first."""
+        if path not in self.timelines:
+            folder = os.path.join(self.directory, path[:-len('.json')])
+            entries = []
+            if os.path.isdir(folder):
+                for filename in os.listdir(folder):
+                    stem, extension = os.path.splitext(filename)
+                    if extension == '.json' and stem.isdigit():
+                        entries.append((int(stem), os.path.join(folder, filename)))
+            self.timelines[path] = sorted(entries)
+        return self.timelines[path]
+
+    def load(self, path, clock):
+        """The recorded body for a path at `clock` seconds into the recording, or None."""
+        fixed = os.path.join(self.directory, path)
+        if os.path.isfile(fixed):
+            with open(fixed, 'rb') as body_file:
+                return body_file.read()
+        timeline = self.get_timeline(path)
+        if not timeline:
+            return None
+        start = timeline[0][0]
+        chosen = timeline[0][1]
+        for timestamp, filename in timeline:
+            if timestamp - start > clock:
+                break
+            chosen = filename
+        with open(chosen, 'rb') as body_file:
+            return body_file.read()
+
+
+def create_app(source, latency=0.0, jitter=0.0, error_rate=0.0, rate=None, speed=1.0, start_offset=0.0):
+    """Build the stand-in server for a SyntheticTournament or Recordings source."""
+    standin = Flask(__name__)
+    started = time.time()
+    bucket = {'tokens': None, 'updated': None, 'lock': threading.Lock()}
+    stats = {'requests': 0, 'rate_limited': 0}
+
+    def get_clock():
+        return (time.time() - started) * speed + start_offset
+
+    def take_token():
+        with bucket['lock']:
+            now = time.time()
+            tokens = 1.0 if bucket['tokens'] is None else min(1.0, bucket['tokens'] + (now - bucket['updated']) * rate)
+            bucket['updated'] = now
+            if tokens < 1.0:
+                bucket['tokens'] = tokens
+                return False
+            bucket['tokens'] = tokens - 1.0
+            return True
+
+    @standin.route('/_standin/stats')
+    def get_stats():
+        return {**stats, 'clock': get_clock()}
+
+    @standin.route('/<path:path>')
+    def serve(path):
+        stats['requests'] += 1
+        if latency or jitter:
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        # Same shape as the trial key's limit: too fast, or unlucky, gets a 429 with Retry-After
+        if (rate and not take_token()) or random.random() < error_rate:
+            stats['rate_limited'] += 1
+            return Response('{"message": "Too Many Requests"}', status=429, mimetype='application/json', headers={'Retry-After': '1'})
+
+        # Accept any base path; only the part after the year matters
+        parts = path.split('/')
+        if '..' in parts:
+            return Response(status=404)
+        year_index = next((i for i, part in enumerate(parts) if part.isdigit() and len(part) == 4), None)
+        if year_index is None:
+            return Response(status=404)
+        relative = '/'.join(parts[year_index:])
+        clock = get_clock()
+
+        if isinstance(source, Recordings):
+            body = source.load(relative, clock)
+            if body is None:
+                return Response(status=404)
+            response = Response(body, mimetype='application/json')
+            response.add_etag()
+            return response.make_conditional(request)
+
+        if relative.endswith('/tournaments/schedule.json'):
+            payload = source.schedule(clock)
+        elif relative.endswith(f'/{source.tournament_id}/summary.json'):
+            payload = source.summary(clock)
+        elif relative.endswith(f'/{source.tournament_id}/leaderboard.json'):
+            payload = source.leaderboard(clock)
+        else:
+            return Response(status=404)
+        # ETags like the real API's, so conditional requests get 304s
+        response = Response(json.dumps(payload), mimetype='application/json')
+        response.add_etag()
+        return response.make_conditional(request)
+
+    return standin
+
+
+def record(year, tournament_id, out, interval=600, count=1):
+    """Save the schedule and summary once, then `count` leaderboard snapshots `interval` seconds apart."""
+    import upstream
+
+    def save(path, payload):
+        full_path = os.path.join(out, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as out_file:
+            json.dump(payload, out_file)
+        print(f"Saved {full_path}")
+
+    for path in (upstream.schedule_path(year), upstream.summary_path(year, tournament_id)):
+        payload = upstream.fetch_json(upstream.build_url(path))
+        if payload is not None:
+            save(path, payload)
+
+    leaderboard_path = upstream.leaderboard_path(year, tournament_id)
+    for index in range(count):
+        payload = upstream.fetch_json(upstream.build_url(leaderboard_path))
+        if payload is not None:
+            save(f"{leaderboard_path[:-len('.json')]}/{int(time.time())}.json", payload)
+            if payload.get('status') in ('closed', 'complete'):
+                break
+        if index + 1 < count:
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline SportsRadar stand-in')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Serve recorded or synthetic responses')
+    source_group = serve_parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument('--recordings', help='Directory written by `record`')
+    source_group.add_argument('--synthetic', action='store_true', help='Generate a tournament instead')
+    serve_parser.add_argument('--port', type=int, default=8010)
+    serve_parser.add_argument('--year', type=int, default=2025)
+    serve_parser.add_argument('--tournament', default='standin-0000-0000-0000-000000000000')
+    serve_parser.add_argument('--players', type=int, default=156)
+    serve_parser.add_argument('--seed', type=int, default=1)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds on top of --latency')
+    serve_parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 429')
+    serve_parser.add_argument('--rate', type=float, default=None, help='Requests per second before answering 429')
+    serve_parser.add_argument('--speed', type=float, default=1.0, help='Tournament seconds per real second')
+    serve_parser.add_argument('--start-offset', type=float, default=0.0, help='Tournament seconds to start at')
+
+    record_parser = commands.add_parser('record', help='Record real responses for replay')
+    record_parser.add_argument('--year', type=int, default=2025)
+    record_parser.add_argument('--tournament', required=True)
+    record_parser.add_argument('--out', default='recordings')
+    record_parser.add_argument('--interval', type=float, default=600)
+    record_parser.add_argument('--count', type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.year, args.tournament, args.out, args.interval, args.count)
+        return
+
+    if args.synthetic:
+        source = SyntheticTournament(args.year, args.tournament, args.players, args.seed)
+    else:
+        source = Recordings(args.recordings)
+    standin = create_app(source, args.latency, args.jitter, args.error_rate, args.rate, args.speed, args.start_offset)
+    standin.run(port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
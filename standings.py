@@ -0,0 +1,140 @@
+import os
+import logging
+import sqlite3
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Where completed events' results are memoized; set STANDINGS_PATH to '' to keep them in memory only
+STANDINGS_PATH = os.getenv('STANDINGS_PATH', 'season_standings.sqlite3')
+
+# Schedule statuses for events whose results are final
+COMPLETED_STATUSES = {'closed', 'complete'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS league_event_results (
+    league TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    tournament_id TEXT NOT NULL,
+    name TEXT,
+    end_date TEXT,
+    member TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    PRIMARY KEY (league, year, tournament_id, member)
+) WITHOUT ROWID;
+"""
+
+
+def member_payouts(field, payouts, picks):
+    """Each member's winnings from one event: the official money when it's posted, else the projection."""
+    results = {}
+    for member, pick in picks.items():
+        player = field.lookup(pick)
+        if player is None:
+            results[member] = 0
+        elif player.money is not None:
+            results[member] = round(player.money)
+        else:
+            results[member] = round(payouts.get(player.key, 0))
+    return results
+
+
+def completed_events(schedule):
+    """List the schedule's finished events, oldest first."""
+    events = [event for event in (schedule or {}).get('tournaments', []) if event.get('status') in COMPLETED_STATUSES]
+    return sorted(events, key=lambda event: event.get('end_date', ''))
+
+
+class SeasonStandings:
+    """One league's running season totals: completed events are folded in once, the live event is added on top per read."""
+
+    def __init__(self, league, year, path=STANDINGS_PATH):
+        self.league = league
+        self.year = year
+        self.path = path
+        self.events = {}
+        self.totals = Counter()
+        self.version = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if self.path:
+            self._connect().executescript(SCHEMA)
+        self.sync()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def sync(self):
+        """Fold in events another worker (or an earlier run) already stored."""
+        if not self.path:
+            return
+        rows = self._connect().execute(
+            "SELECT tournament_id, name, end_date, member, amount FROM league_event_results WHERE league = ? AND year = ?",
+            (self.league, self.year)
+        ).fetchall()
+        stored = {}
+        for tournament_id, name, end_date, member, amount in rows:
+            event = stored.setdefault(tournament_id, {'name': name, 'end_date': end_date, 'payouts': {}})
+            event['payouts'][member] = amount
+        for tournament_id, event in stored.items():
+            self._fold(tournament_id, event)
+
+    def _fold(self, tournament_id, event):
+        with self._lock:
+            if tournament_id in self.events:
+                return
+            self.events[tournament_id] = event
+            self.totals.update(event['payouts'])
+            self.version += 1
+
+    def has_event(self, tournament_id):
+        return tournament_id in self.events
+
+    def add_event(self, tournament, payouts):
+        """Store a completed event's per-member payouts and fold them into the totals (once per event)."""
+        tournament_id = tournament['id']
+        if self.has_event(tournament_id):
+            return
+        event = {'name': tournament.get('name', ''), 'end_date': tournament.get('end_date', ''), 'payouts': dict(payouts)}
+        if self.path:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO league_event_results (league, year, tournament_id, name, end_date, member, amount) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (self.league, self.year, tournament_id, event['name'], event['end_date'], member, amount)
+                        for member, amount in payouts.items()
+                    ]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self._fold(tournament_id, event)
+        logger.info(f"Folded {event['name'] or tournament_id} into the {self.year} {self.league} standings")
+
+    def standings(self, members, live_id=None, live_payouts=None):
+        """Rank members by season winnings, counting the live event unless it's already folded in."""
+        live_payouts = live_payouts if live_id and not self.has_event(live_id) else {}
+        rows = []
+        for member in members:
+            completed = self.totals.get(member, 0)
+            live = live_payouts.get(member, 0)
+            rows.append({
+                "member": member,
+                "completed": completed,
+                "live": live,
+                "total": completed + live
+            })
+        rows.sort(key=lambda row: (-row["total"], row["member"]))
+        for index, row in enumerate(rows):
+            # Members level on money share the higher rank
+            row["rank"] = rows[index - 1]["rank"] if index and rows[index - 1]["total"] == row["total"] else index + 1
+        return rows
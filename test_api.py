@@ -1,30 +1,16 @@
-import os
-import requests
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# SportsRadar API configuration
-SPORTSRADAR_API_KEY = os.getenv('SPORTSRADAR_API_KEY')
-SPORTSRADAR_BASE_URL = "https://api.sportradar.com/golf/trial/pga/v3/en"
+import upstream
+from upstream import SPORTSRADAR_API_KEY
 
 def fetch_leaderboard():
     """Fetch tournament leaderboard data."""
     try:
-        url = f"{SPORTSRADAR_BASE_URL}/2025/tournaments/2cba1945-dc1c-4131-92f4-cfdac8c45060/leaderboard.json"
-        headers = {"accept": "application/json"}
-        params = {"api_key": SPORTSRADAR_API_KEY}
+        url = upstream.build_url(upstream.leaderboard_path(2025, "2cba1945-dc1c-4131-92f4-cfdac8c45060"))
         
         print(f"Making API request to: {url}")
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
-            
-        return response.json()
+        data = upstream.fetch_json(url)
+        if data is None:
+            print("Error: could not fetch leaderboard")
+        return data
     except Exception as e:
         print(f"Error fetching leaderboard: {str(e)}")
         return None
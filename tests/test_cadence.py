@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
+from cadence import CADENCE, plan_refresh, seconds_until_play
+from field import Field
+
+EASTERN = pytz.timezone('America/New_York')
+
+
+def local_time(*args):
+    return EASTERN.localize(datetime(*args)).timestamp()
+
+
+def make_field(thrus, round_number=1, score=0, cut=0):
+    """A field on `round_number`, one player per entry of `thrus`, plus `cut` players who missed the cut."""
+    players = []
+    for number, thru in enumerate(thrus):
+        rounds = [{'sequence': sequence, 'thru': 18, 'score': 0, 'strokes': 70} for sequence in range(1, round_number)]
+        rounds.append({'sequence': round_number, 'thru': thru, 'score': score, 'strokes': thru * 4})
+        players.append({'first_name': 'Player', 'last_name': str(number), 'position': number + 1, 'score': score,
+                        'status': 'ACTIVE', 'rounds': rounds})
+    for number in range(cut):
+        players.append({'first_name': 'Cut', 'last_name': str(number), 'position': 100, 'status': 'CUT',
+                        'rounds': [{'sequence': 1, 'thru': 18}, {'sequence': 2, 'thru': 18}]})
+    return Field({'leaderboard': players})
+
+
+def make_tournament(status='inprogress', round_number=1, start_date='2025-04-17'):
+    return {'status': status, 'round': round_number, 'start_date': start_date, 'course_timezone': 'America/New_York'}
+
+
+def test_closed_event_stops_polling():
+    field = make_field([18] * 10, round_number=4)
+    plan = plan_refresh(make_tournament('closed', 4), None, field, now=local_time(2025, 4, 20, 19))
+    assert plan['phase'] == 'closed'
+    assert plan['interval'] is None
+
+
+def test_before_start_sleeps_until_the_first_morning():
+    now = local_time(2025, 4, 16, 12)
+    plan = plan_refresh(make_tournament(), None, make_field([0] * 10), now=now)
+    assert plan['phase'] == 'before_start'
+    assert plan['interval'] == local_time(2025, 4, 17, CADENCE['day_start']) - now
+
+
+def test_live_polls_at_the_live_interval():
+    plan = plan_refresh(make_tournament(), None, make_field([5] * 60), now=local_time(2025, 4, 17, 11))
+    assert plan['phase'] == 'live'
+    assert plan['interval'] == CADENCE['live_interval']
+
+
+@pytest.mark.parametrize('on_course', [1, 3, 10, 20])
+def test_live_final_groups_are_not_polled_less_often(on_course):
+    # Sunday afternoon: everyone else is in, only the leaders are still out
+    previous = make_field([17] * on_course + [18] * 60, round_number=4, score=-1)
+    field = make_field([16] * on_course + [18] * 60, round_number=4, score=-2)
+    plan = plan_refresh(make_tournament(round_number=4), previous, field, now=local_time(2025, 4, 20, 16))
+    assert plan['phase'] == 'live'
+    assert plan['interval'] == CADENCE['live_interval']
+
+
+def test_live_backs_off_while_nothing_changes_and_caps():
+    field = make_field([9] * 30)
+    now = local_time(2025, 4, 17, 11)
+    plan = None
+    intervals = []
+    for _ in range(5):
+        plan = plan_refresh(make_tournament(), field, field, plan, now=now)
+        intervals.append(plan['interval'])
+    live = CADENCE['live_interval']
+    assert intervals[:2] == [live * CADENCE['backoff'], live * CADENCE['backoff'] ** 2]
+    assert max(intervals) == CADENCE['max_interval']
+    assert plan['quiet_polls'] == 5
+
+
+def test_any_change_resets_the_backoff():
+    previous = make_field([9] * 30)
+    field = make_field([10] * 30)
+    plan = plan_refresh(make_tournament(), previous, field, {'quiet_polls': 4}, now=local_time(2025, 4, 17, 11))
+    assert plan['quiet_polls'] == 0
+    assert plan['interval'] == CADENCE['live_interval']
+
+
+def test_suspended_play_checks_back_for_the_restart():
+    field = make_field([7] * 40)
+    plan = plan_refresh(make_tournament('suspended'), field, field, now=local_time(2025, 4, 17, 14))
+    assert plan['phase'] == 'suspended'
+    assert plan['interval'] == CADENCE['suspended_interval']
+
+
+def test_finished_round_sleeps_until_morning_then_waits_for_the_first_tee_time():
+    field = make_field([18] * 70, round_number=2, cut=10)
+    evening = local_time(2025, 4, 18, 19)
+    plan = plan_refresh(make_tournament(round_number=2), field, field, now=evening)
+    assert plan['phase'] == 'between_rounds'
+    assert plan['round_done'] == [2, '2025-04-18']
+    assert plan['interval'] == local_time(2025, 4, 19, CADENCE['day_start']) - evening
+
+    # Next morning the feed still reports round 2 finished; that's the wait for round 3, not another night
+    plan = plan_refresh(make_tournament(round_number=2), field, field, plan, now=local_time(2025, 4, 19, 7))
+    assert plan['phase'] == 'waiting'
+    assert plan['round_done'] == [2, '2025-04-18']
+    assert plan['interval'] <= CADENCE['max_interval']
+
+
+def test_overnight_sleeps_until_play_hours():
+    now = local_time(2025, 4, 18, 2)
+    plan = plan_refresh(make_tournament(round_number=2), None, make_field([0] * 70, round_number=2), now=now)
+    assert plan['phase'] == 'overnight'
+    assert plan['interval'] == local_time(2025, 4, 18, CADENCE['day_start']) - now
+
+
+def test_final_round_done_waits_for_the_event_to_close():
+    field = make_field([18] * 70, round_number=4)
+    plan = plan_refresh(make_tournament(round_number=4), field, field, now=local_time(2025, 4, 20, 18))
+    assert plan['phase'] == 'waiting'
+    assert plan['round_done'] is None
+
+
+def test_seconds_until_play_across_the_spring_clock_change():
+    # 2025-03-09 02:00 EST jumps to 03:00 EDT, so midnight to 6am is five real hours
+    assert seconds_until_play(local_time(2025, 3, 9, 0), EASTERN) == 5 * 3600
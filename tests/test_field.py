@@ -0,0 +1,116 @@
+import pytest
+
+from field import Field, diff_fields, merge_changes, normalize_name
+
+
+def make_raw(name, position, score=0, thru=0, status='ACTIVE'):
+    first_name, last_name = name.split(' ', 1)
+    return {
+        'first_name': first_name, 'last_name': last_name, 'position': position, 'score': score, 'status': status,
+        'rounds': [{'sequence': 1, 'thru': thru, 'score': score, 'strokes': 0}]
+    }
+
+
+def make_field(*players):
+    return Field({'leaderboard': list(players)})
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Ludvig Åberg', 'ludvig aberg'),
+    ('Nicolai Højgaard', 'nicolai hojgaard'),
+    ('Thorbjørn Olesen', 'thorbjorn olesen'),
+    ('Sebastián Muñoz', 'sebastian munoz'),
+    ('Davis Love III', 'davis love'),
+    ('Sam Burns Jr.', 'sam burns'),
+    ('Harold Varner III', 'harold varner'),
+    ("Matt O'Neill", 'matt oneill'),
+    ('  SCOTTIE   scheffler ', 'scottie scheffler'),
+    ('', '')
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+
+def test_normalize_name_joins_initials():
+    assert normalize_name('J.J. Spaun') == normalize_name('J. J. Spaun') == normalize_name('JJ Spaun') == 'jj spaun'
+
+
+def test_normalize_name_keeps_a_lone_suffix_word():
+    assert normalize_name('V') == 'v'
+
+
+def test_lookup_ignores_accents_and_suffixes():
+    field = make_field(make_raw('Ludvig Åberg', 1), make_raw('Davis Love III', 2))
+    assert field.lookup('ludvig aberg').name == 'Ludvig Åberg'
+    assert field.lookup('Davis Love').position == 2
+    assert field.lookup('Tiger Woods') is None
+
+
+def test_search_matches_any_name_word_in_leaderboard_order():
+    field = make_field(
+        make_raw('Xander Schauffele', 1), make_raw('Rory McIlroy', 2), make_raw('Scottie Scheffler', 3),
+        make_raw('Ludvig Åberg', 4)
+    )
+    assert [player.name for player in field.search('Sch')] == ['Xander Schauffele', 'Scottie Scheffler']
+    assert [player.name for player in field.search('scottie s')] == ['Scottie Scheffler']
+    assert [player.name for player in field.search('ABE')] == ['Ludvig Åberg']
+    assert field.search('zz') == []
+    assert len(field.search('')) == 4
+
+
+def test_diff_from_nothing_adds_everyone():
+    changes = diff_fields(None, make_field(make_raw('Rory McIlroy', 1)))
+    assert changes == [
+        {'player': 'Rory McIlroy', 'position': 1, 'tied': False, 'score': 0, 'thru': 0, 'status': 'ACTIVE', 'added': True}
+    ]
+
+
+def test_diff_skips_unchanged_players():
+    previous = make_field(make_raw('Rory McIlroy', 1, -3, 9), make_raw('Jon Rahm', 2, -2, 9))
+    current = make_field(make_raw('Rory McIlroy', 1, -3, 9), make_raw('Jon Rahm', 2, -2, 9))
+    assert diff_fields(previous, current) == []
+
+
+def test_diff_reports_movement_and_removals():
+    previous = make_field(make_raw('Rory McIlroy', 1, -3), make_raw('Jon Rahm', 'T5', -1), make_raw('Tiger Woods', 9))
+    current = make_field(make_raw('Rory McIlroy', 3, -3), make_raw('Jon Rahm', 1, -4))
+    changes = {change['player']: change for change in diff_fields(previous, current)}
+    assert changes['Jon Rahm']['moved'] == 4
+    assert changes['Jon Rahm']['previous_score'] == -1
+    assert changes['Rory McIlroy']['moved'] == -2
+    assert changes['Tiger Woods'] == {'player': 'Tiger Woods', 'removed': True}
+
+
+def test_diff_movement_unknown_without_a_place():
+    previous = make_field(make_raw('Rory McIlroy', '-'))
+    current = make_field(make_raw('Rory McIlroy', 4, -1, 3))
+    assert diff_fields(previous, current)[0]['moved'] is None
+
+
+def test_merge_keeps_where_the_range_started():
+    first = [{'player': 'Jon Rahm', 'position': 5, 'previous_position': 10, 'previous_score': 0, 'score': -2, 'moved': 5}]
+    second = [{'player': 'Jon Rahm', 'position': 2, 'previous_position': 5, 'previous_score': -2, 'score': -5, 'moved': 3}]
+    merged = merge_changes([first, second])
+    assert merged == [{'player': 'Jon Rahm', 'position': 2, 'previous_position': 10, 'previous_score': 0, 'score': -5, 'moved': 8}]
+
+
+def test_merge_player_added_partway_has_no_movement():
+    first = [{'player': 'Jon Rahm', 'position': 5, 'added': True}]
+    second = [{'player': 'Jon Rahm', 'position': 2, 'previous_position': 5, 'previous_score': -2, 'moved': 3}]
+    assert merge_changes([first, second]) == [{'player': 'Jon Rahm', 'position': 2, 'added': True}]
+
+
+def test_merge_matches_players_by_normalized_name():
+    first = [{'player': 'Ludvig Åberg', 'position': 8, 'previous_position': 9, 'moved': 1}]
+    second = [{'player': 'Ludvig Aberg', 'position': 'T3', 'previous_position': 8, 'moved': 5}]
+    merged = merge_changes([first, second])
+    assert len(merged) == 1
+    assert merged[0]['moved'] == 6
+
+
+def test_merge_keeps_untouched_players_and_removals():
+    merged = merge_changes([
+        [{'player': 'Rory McIlroy', 'position': 1, 'previous_position': 2, 'moved': 1}],
+        [{'player': 'Tiger Woods', 'removed': True}]
+    ])
+    assert [change['player'] for change in merged] == ['Rory McIlroy', 'Tiger Woods']
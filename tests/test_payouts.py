@@ -0,0 +1,81 @@
+import pytest
+
+from field import Player
+from payouts import PayoutTable, position_number, project_payouts
+
+
+def make_player(name, position, status='ACTIVE'):
+    first_name, last_name = name.split(' ', 1)
+    return Player({'first_name': first_name, 'last_name': last_name, 'position': position, 'status': status})
+
+
+@pytest.fixture
+def table():
+    # Three paid places, so ties can run off the end
+    return PayoutTable([1000, 600, 400])
+
+
+def test_split_single_positions(table):
+    assert table.split(1) == 1000
+    assert table.split(3) == 400
+    assert table.split(4) == 0
+
+
+def test_split_averages_the_places_a_tie_occupies(table):
+    assert table.split(1, 2) == 800
+    assert table.split(1, 3) == pytest.approx(2000 / 3)
+
+
+def test_split_tie_straddling_the_last_paid_place(table):
+    # Places 2-4: two paid slots shared by three players
+    assert table.split(2, 3) == pytest.approx(1000 / 3)
+    # Places 3-4: one paid slot shared by two
+    assert table.split(3, 2) == 200
+
+
+def test_split_tie_entirely_past_the_paid_places(table):
+    assert table.split(4, 3) == 0
+    assert table.split(50, 2) == 0
+
+
+def test_from_structure_scales_and_extends():
+    table = PayoutTable.from_structure({1: 100, 2: 60, 3: 40}, scale=2.0, extend_to=10)
+    # Each extra place pays one more step (40) less, stopping before reaching zero
+    assert table.amounts == [200, 120, 80, 40]
+
+
+def test_from_structure_sorts_positions():
+    assert PayoutTable.from_structure({2: 60, 1: 100}).amounts == [100, 60]
+
+
+@pytest.mark.parametrize('position, expected', [
+    (3, 3), ('3', 3), ('T3', 3), ('T12', 12), ('-', None), ('CUT', None), (None, None), ('', None)
+])
+def test_position_number(position, expected):
+    assert position_number(position) == expected
+
+
+def test_project_payouts_splits_ties_and_skips_unpaid(table):
+    players = [
+        make_player('Scottie Scheffler', 1),
+        make_player('Rory McIlroy', 'T2'),
+        make_player('Xander Schauffele', 2),
+        make_player('Jon Rahm', 4),
+        make_player('Tiger Woods', 70, status='CUT'),
+        make_player('Brooks Koepka', '-', status='WD')
+    ]
+    payouts = project_payouts(players, table)
+    assert payouts == {'scottie scheffler': 1000, 'rory mcilroy': 500, 'xander schauffele': 500, 'jon rahm': 0}
+
+
+def test_project_payouts_tie_straddling_the_end_pays_everyone_equally(table):
+    players = [make_player('Scottie Scheffler', 1)] + [make_player(f'Player {n}', 2) for n in range(3)]
+    payouts = project_payouts(players, table)
+    tied = [payouts[f'player {n}'] for n in range(3)]
+    assert tied == [333, 333, 333]
+    # Rounding aside, a tie never pays out more than the places it covers
+    assert sum(tied) <= 600 + 400
+
+
+def test_project_payouts_empty_field(table):
+    assert project_payouts([], table) == {}
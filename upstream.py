@@ -0,0 +1,341 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from metrics import Counter, Histogram
+from cache_backend import MemoryBackend
+from response_cache import BodyRecorder, is_immutable, open_response_cache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# SportsRadar API configuration
+SPORTSRADAR_API_KEY = os.getenv('SPORTSRADAR_API_KEY')
+# Point SPORTSRADAR_BASE_URL at standin.py to run everything offline
+SPORTSRADAR_BASE_URL = os.getenv('SPORTSRADAR_BASE_URL', "https://api.sportradar.com/golf/trial/pga/v3/en")
+
+# Upstream client settings
+UPSTREAM = {
+    'connect_timeout': float(os.getenv('SPORTSRADAR_CONNECT_TIMEOUT', '3.05')),
+    'read_timeout': float(os.getenv('SPORTSRADAR_READ_TIMEOUT', '10')),
+    'pool_size': 10,  # Keep-alive connections kept open to api.sportradar.com
+    'rate': float(os.getenv('SPORTSRADAR_RATE', '1.0')),  # Sustained requests per second (trial keys allow 1 QPS)
+    'burst': int(os.getenv('SPORTSRADAR_BURST', '1')),  # Requests allowed back to back before the rate applies
+    'max_retries': 3,
+    'base_backoff': 1.0,  # Seconds; doubled on each retry and fully jittered
+    'max_backoff': 30.0
+}
+
+# Retry these statuses; everything else other than 200 is a hard failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+UPSTREAM_LATENCY = Histogram('millerlite_upstream_request_duration_seconds', 'SportsRadar request latency by endpoint')
+UPSTREAM_RESPONSES = Counter('millerlite_upstream_responses_total', 'SportsRadar responses by endpoint and status code')
+UPSTREAM_ERRORS = Counter('millerlite_upstream_errors_total', 'SportsRadar requests that failed without a response')
+UPSTREAM_RATE_LIMITED = Counter('millerlite_upstream_rate_limited_total', 'SportsRadar 429 responses')
+UPSTREAM_RETRIES = Counter('millerlite_upstream_retries_total', 'SportsRadar requests retried after a 429 or server error')
+UPSTREAM_CACHE = Counter(
+    'millerlite_upstream_cache_total',
+    'SportsRadar lookups by response cache result (fresh and not_modified are served from disk, stored went upstream)'
+)
+
+
+# Where the token bucket lives; the app swaps in its cache backend so the budget is shared across workers
+RATE_LIMITER = {'bucket': MemoryBackend()}
+
+
+def set_rate_limiter(bucket):
+    """Use a different token store (anything with reserve_token(rate, capacity))."""
+    RATE_LIMITER['bucket'] = bucket
+
+
+# On-disk cache of response bodies and their validators, shared by the app and the CLI tools; None when disabled
+RESPONSE_CACHE = {'cache': open_response_cache()}
+
+
+def set_response_cache(cache):
+    """Use a different response cache (a response_cache.ResponseCache, or None to go upstream every time)."""
+    RESPONSE_CACHE['cache'] = cache
+
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=UPSTREAM['pool_size'], pool_maxsize=UPSTREAM['pool_size'])
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'accept': 'application/json',
+        'accept-encoding': 'gzip, deflate'
+    })
+    return session
+
+
+# One pooled keep-alive session per process, so repeat calls skip the TCP+TLS handshake
+SESSION = _create_session()
+
+
+def get_endpoint_label(url):
+    """Get a short label for a SportsRadar URL, e.g. 'leaderboard'."""
+    return url.rsplit('/', 1)[-1].split('.', 1)[0]
+
+
+def build_url(path):
+    """Build a SportsRadar URL from a path like '2025/tournaments/schedule.json'."""
+    return f"{SPORTSRADAR_BASE_URL}/{path}"
+
+
+def get_cache_key(url, params=None):
+    """Key a request by its URL and any params other than the API key."""
+    return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+
+def load_cached(entry, parser=None):
+    """Parse a cached body (through `parser` if given), or None if it can't be read."""
+    try:
+        with RESPONSE_CACHE['cache'].open_body(entry) as body:
+            return parser(body) if parser is not None else json.load(body)
+    except Exception as e:
+        logger.error(f"Error reading cached response for {entry['key']}: {str(e)}")
+        return None
+
+
+def check_response_cache(url, params=None, parser=None, max_age=None):
+    """Look a request up in the response cache: returns (key, entry, payload), with a payload only when no request is needed.
+
+    Finished events never change, and anything fetched less than `max_age` seconds ago is taken as is; other
+    entries come back without a payload, to be revalidated.
+    """
+    cache = RESPONSE_CACHE['cache']
+    if cache is None:
+        return None, None, None
+    key = get_cache_key(url, params)
+    try:
+        entry = cache.lookup(key)
+    except Exception as e:
+        logger.error(f"Error reading response cache: {str(e)}")
+        return None, None, None
+    if entry is not None and (entry['immutable'] or (max_age is not None and time.time() - entry['fetched_at'] < max_age)):
+        payload = load_cached(entry, parser)
+        if payload is not None:
+            UPSTREAM_CACHE.inc(endpoint=get_endpoint_label(url), result='fresh')
+            return key, entry, payload
+    return key, entry, None
+
+
+def get_conditional_headers(entry, headers=None):
+    """Add the validators of a cached entry to a request's headers, so an unchanged body comes back as a 304."""
+    if entry is None:
+        return headers
+    conditional = dict(headers or {})
+    if entry['etag']:
+        conditional['If-None-Match'] = entry['etag']
+    if entry['last_modified']:
+        conditional['If-Modified-Since'] = entry['last_modified']
+    return conditional
+
+
+def store_response(key, recorder, response, payload):
+    """Save a fetched body with its validators; finished events are stored as never needing revalidation."""
+    try:
+        digest, compressed = recorder.finish()
+        RESPONSE_CACHE['cache'].store(
+            key, digest, compressed,
+            response.headers.get('ETag'), response.headers.get('Last-Modified'), is_immutable(payload)
+        )
+        UPSTREAM_CACHE.inc(endpoint=get_endpoint_label(response.url), result='stored')
+    except Exception as e:
+        logger.error(f"Error caching response for {key}: {str(e)}")
+
+
+def read_payload(response, parser=None, recorder=None):
+    """Parse a 200 body (through `parser` if given), copying it into `recorder` as it's read when caching."""
+    if parser is None:
+        if recorder is None:
+            return response.json()
+        return json.loads(recorder.feed(response.content))
+    # Let urllib3 undo the gzip so the parser sees plain JSON as it arrives
+    response.raw.decode_content = True
+    if recorder is None:
+        return parser(response.raw)
+    recorder.stream = response.raw
+    payload = parser(recorder)
+    # The cached copy has to be the whole body, even if the parser stopped early
+    while recorder.read(65536):
+        pass
+    return payload
+
+
+def reserve_request_slot():
+    """Take a token from the shared bucket and return how long to wait before sending."""
+    return RATE_LIMITER['bucket'].reserve_token(UPSTREAM['rate'], UPSTREAM['burst'])
+
+
+def get_retry_delay(attempt, response=None):
+    """Get the delay before retry number `attempt`, honoring Retry-After when the server sends one."""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), UPSTREAM['max_backoff'])
+        except ValueError:
+            try:
+                return min(max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()), UPSTREAM['max_backoff'])
+            except (TypeError, ValueError):
+                pass
+    # Full jitter keeps workers that were throttled together from retrying together
+    return random.uniform(0, min(UPSTREAM['max_backoff'], UPSTREAM['base_backoff'] * 2 ** attempt))
+
+
+def send_request(url, params=None, headers=None, stream=False):
+    """Send one GET over the pooled session; returns the response, or None on a transport error."""
+    endpoint = get_endpoint_label(url)
+    request_params = {'api_key': SPORTSRADAR_API_KEY}
+    request_params.update(params or {})
+    try:
+        logger.info(f"Making API request to: {url}")
+        start_time = time.perf_counter()
+        response = SESSION.get(
+            url,
+            params=request_params,
+            headers=headers,
+            stream=stream,
+            timeout=(UPSTREAM['connect_timeout'], UPSTREAM['read_timeout'])
+        )
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start_time, endpoint=endpoint)
+        UPSTREAM_RESPONSES.inc(endpoint=endpoint, status=response.status_code)
+        return response
+    except requests.exceptions.Timeout:
+        logger.error("Request timed out")
+        UPSTREAM_ERRORS.inc(endpoint=endpoint, reason='timeout')
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error making API request: {str(e)}")
+        UPSTREAM_ERRORS.inc(endpoint=endpoint, reason='error')
+    return None
+
+
+def handle_response(url, response, attempt, parser=None, cache_key=None, cached=None):
+    """Decide what to do with a response: returns ('done', payload) or ('retry', delay).
+
+    `parser`, if given, reads the body from a file-like stream instead of it being loaded whole. With a
+    `cache_key`, a 200 body is saved to the response cache and a 304 is answered from the `cached` entry.
+    """
+    endpoint = get_endpoint_label(url)
+    if response is not None and response.status_code == 200:
+        try:
+            recorder = BodyRecorder() if cache_key is not None else None
+            payload = read_payload(response, parser, recorder)
+            if recorder is not None:
+                store_response(cache_key, recorder, response, payload)
+            return 'done', payload
+        except Exception as e:
+            logger.error(f"Invalid JSON from {endpoint}: {str(e)}")
+            return 'done', None
+        finally:
+            response.close()
+
+    if response is not None and response.status_code == 304 and cached is not None:
+        UPSTREAM_CACHE.inc(endpoint=endpoint, result='not_modified')
+        RESPONSE_CACHE['cache'].touch(cache_key)
+        return 'done', load_cached(cached, parser)
+
+    if response is not None and response.status_code not in RETRY_STATUSES:
+        logger.error(f"API Error: {response.status_code}")
+        logger.error(f"Response: {response.text[:500]}")
+        return 'done', None
+
+    if response is not None and response.status_code == 429:
+        logger.warning("Rate limit exceeded")
+        UPSTREAM_RATE_LIMITED.inc(endpoint=endpoint)
+
+    if attempt >= UPSTREAM['max_retries']:
+        logger.error(f"Max retries reached for {endpoint}")
+        return 'done', None
+
+    delay = get_retry_delay(attempt, response)
+    UPSTREAM_RETRIES.inc(endpoint=endpoint)
+    logger.info(f"Retrying {endpoint} in {delay:.1f} seconds (attempt {attempt + 1})")
+    return 'retry', delay
+
+
+def fetch_json(url, params=None, headers=None, parser=None, max_age=None):
+    """GET a SportsRadar URL with rate limiting and retries; returns parsed JSON (or `parser`'s result) or None.
+
+    Goes through the response cache (see check_response_cache): cached bodies that are still good cost no request,
+    and the rest are revalidated conditionally.
+    """
+    cache_key, cached, payload = check_response_cache(url, params, parser, max_age)
+    if payload is not None:
+        return payload
+    request_headers = get_conditional_headers(cached, headers)
+
+    for attempt in range(UPSTREAM['max_retries'] + 1):
+        wait_time = reserve_request_slot()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        response = send_request(url, params, request_headers, parser is not None)
+        action, value = handle_response(url, response, attempt, parser, cache_key, cached)
+        if action == 'done':
+            return value
+        time.sleep(value)
+    return None
+
+
+async def fetch_json_async(url, params=None, headers=None, parser=None, max_age=None):
+    """Asyncio variant of fetch_json; waits without blocking the event loop."""
+    # Disk reads, requests and parsing are all blocking, so they run on the default executor
+    cache_key, cached, payload = await asyncio.to_thread(check_response_cache, url, params, parser, max_age)
+    if payload is not None:
+        return payload
+    request_headers = get_conditional_headers(cached, headers)
+
+    for attempt in range(UPSTREAM['max_retries'] + 1):
+        wait_time = reserve_request_slot()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+        response = await asyncio.to_thread(send_request, url, params, request_headers, parser is not None)
+        action, value = await asyncio.to_thread(handle_response, url, response, attempt, parser, cache_key, cached)
+        if action == 'done':
+            return value
+        await asyncio.sleep(value)
+    return None
+
+
+async def fetch_batch_async(urls, parsers=None, max_age=None):
+    """Fetch independent URLs concurrently within the rate limit; returns {name: parsed JSON or None}.
+
+    `parsers` optionally maps a name to a streaming parser for that response (see fetch_json).
+    """
+    names = list(urls)
+    parsers = parsers or {}
+    results = await asyncio.gather(*(
+        fetch_json_async(urls[name], parser=parsers.get(name), max_age=max_age) for name in names
+    ))
+    return dict(zip(names, results))
+
+
+def fetch_batch(urls, parsers=None, max_age=None):
+    """Blocking wrapper around fetch_batch_async for threads without an event loop."""
+    return asyncio.run(fetch_batch_async(urls, parsers, max_age))
+
+
+def schedule_path(year):
+    return f"{year}/tournaments/schedule.json"
+
+
+def summary_path(year, tournament_id):
+    return f"{year}/tournaments/{tournament_id}/summary.json"
+
+
+def leaderboard_path(year, tournament_id):
+    return f"{year}/tournaments/{tournament_id}/leaderboard.json"
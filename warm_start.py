@@ -0,0 +1,53 @@
+import os
+import gzip
+import json
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Where the last good snapshot is kept between restarts; set SNAPSHOT_PATH to '' to disable
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', 'leaderboard_snapshot.json.gz')
+
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(data, last_updated, path=SNAPSHOT_PATH):
+    """Atomically write the snapshot as gzipped JSON, so a crash mid-write never leaves a torn file."""
+    if not path:
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as raw_file:
+            with gzip.GzipFile(fileobj=raw_file, mode='wb', compresslevel=6) as gz_file:
+                gz_file.write(json.dumps({
+                    'version': SNAPSHOT_VERSION,
+                    'last_updated': last_updated,
+                    'data': data
+                }, separators=(',', ':')).encode('utf-8'))
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Error saving warm-start snapshot: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Load the last saved snapshot as {'data', 'last_updated'}, or None if there isn't a usable one."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, 'rb') as gz_file:
+            snapshot = json.loads(gz_file.read())
+        if snapshot.get('version') != SNAPSHOT_VERSION or not snapshot.get('data'):
+            logger.warning(f"Ignoring incompatible warm-start snapshot at {path}")
+            return None
+        return snapshot
+    except Exception as e:
+        logger.error(f"Error loading warm-start snapshot: {str(e)}")
+        return None